@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Fake UniFi Controller
+Stand-in for the UDR7 API so the rotator can be benchmarked and its failure
+handling exercised without touching the real router.
+
+Serves the endpoints the rotator uses, keeping WLAN state in memory:
+  POST /api/auth/login
+  GET  /proxy/network/api/s/<site>/rest/wlanconf
+  GET  /proxy/network/api/s/<site>/rest/wlanconf/<id>
+  PUT  /proxy/network/api/s/<site>/rest/wlanconf/<id>
+  GET  /proxy/network/api/s/<site>/stat/sysinfo
+
+Plus two endpoints for the person running the benchmark:
+  GET  /__fake/stats   request counts, logins, renames
+  POST /__fake/reset   restore the seed WLANs and zero the counters
+
+Example:
+  python3 fake_unifi_controller.py --port 8443 --latency 0.05 --apply-delay 1.5 --error-rate 0.05
+
+Then point the rotator at it by setting CONFIG["unifi_host"] to
+"http://127.0.0.1:8443" (credentials default to CONFIG's admin user/password).
+"""
+
+import argparse
+import json
+import random
+import secrets
+import ssl
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ============================================
+# DEFAULT WLANS - mirrors the UDR7 in PROJECT_RULES.md
+# ============================================
+DEFAULT_WLANS = [
+    {"_id": "692e47980f81923534aec614", "name": "7Oaks", "enabled": True, "security": "wpapsk", "hide_ssid": True},
+    {"_id": "692e4c4b0f81923534aec68a", "name": "7Oaks-IOT", "enabled": True, "security": "wpapsk",
+     "hide_ssid": True, "l2_isolation": True},
+    {"_id": "692e4dc40f81923534aec6d4", "name": "newnative", "enabled": True, "security": "wpapsk", "hide_ssid": True},
+    {"_id": "6935e0c5005cd02fa28aa8bf", "name": "7Oaks-Work", "enabled": True, "security": "wpapsk",
+     "hide_ssid": True},
+    {"_id": "69363fd4005cd02fa28ab902", "name": "Fuck the orange turd", "enabled": True, "security": "open",
+     "hide_ssid": False, "l2_isolation": False, "ap_group_ids": ["6940ace3f338a319aab4b25b"]},
+]
+
+NETWORK_PREFIX = "/proxy/network/api/s/"
+
+
+class FakeController:
+    """In-memory controller state plus the fault-injection knobs"""
+
+    def __init__(self, username="admin", password="C0,5prings@@@", wlans=None, sites=("default",),
+                 latency=0.0, jitter=0.0, apply_delay=0.0, error_rate=0.0, csrf="required",
+                 rotate_csrf=False, session_ttl=7200, seed=None):
+        self.username = username
+        self.password = password
+        self.seed_wlans = wlans or DEFAULT_WLANS
+        self.site_names = list(sites)
+        self.latency = latency
+        self.jitter = jitter
+        self.apply_delay = apply_delay
+        self.error_rate = error_rate
+        self.csrf = csrf  # 'required', 'optional' (checked only if sent) or 'off'
+        self.rotate_csrf = rotate_csrf
+        self.session_ttl = session_ttl
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.sites = {site: {w['_id']: dict(w) for w in self.seed_wlans} for site in self.site_names}
+            # Renames accepted but not yet visible: (site, wlan_id) -> (apply_at, name)
+            self.pending = {}
+            self.sessions = {}  # token -> {"csrf": ..., "expires_at": ...}
+            self.stats = {"requests": {}, "logins": 0, "renames": 0, "injected_errors": 0, "rejected": 0}
+
+    def count(self, key):
+        with self.lock:
+            self.stats['requests'][key] = self.stats['requests'].get(key, 0) + 1
+
+    def delay(self):
+        total = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if total > 0:
+            time.sleep(total)
+
+    def should_fail(self):
+        with self.lock:
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.stats['injected_errors'] += 1
+                return True
+        return False
+
+    def login(self, username, password):
+        with self.lock:
+            if username != self.username or password != self.password:
+                return None
+            token = secrets.token_hex(16)
+            self.sessions[token] = {"csrf": secrets.token_hex(8), "expires_at": time.time() + self.session_ttl}
+            self.stats['logins'] += 1
+            return token, self.sessions[token]['csrf']
+
+    def session_for(self, token):
+        with self.lock:
+            session = self.sessions.get(token)
+            if session and session['expires_at'] > time.time():
+                return session
+            return None
+
+    def apply_pending(self, site):
+        """Make renames whose apply delay has elapsed visible"""
+        now = time.time()
+        with self.lock:
+            for key in [k for k, (apply_at, _) in self.pending.items() if k[0] == site and apply_at <= now]:
+                _, name = self.pending.pop(key)
+                self.sites[site][key[1]]['name'] = name
+
+    def list_wlans(self, site):
+        self.apply_pending(site)
+        with self.lock:
+            return [dict(w) for w in self.sites[site].values()]
+
+    def get_wlan(self, site, wlan_id):
+        self.apply_pending(site)
+        with self.lock:
+            wlan = self.sites[site].get(wlan_id)
+            return dict(wlan) if wlan else None
+
+    def update_wlan(self, site, wlan_id, changes):
+        with self.lock:
+            wlan = self.sites[site].get(wlan_id)
+            if wlan is None:
+                return None
+            for key, value in changes.items():
+                if key in ('_id', 'name'):
+                    continue
+                wlan[key] = value
+            if 'name' in changes and changes['name'] != wlan['name']:
+                self.stats['renames'] += 1
+                if self.apply_delay > 0:
+                    self.pending[(site, wlan_id)] = (time.time() + self.apply_delay, changes['name'])
+                else:
+                    wlan['name'] = changes['name']
+            return dict(wlan)
+
+
+class FakeControllerHandler(BaseHTTPRequestHandler):
+    controller = None  # Set by make_server()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # ---------- helpers ----------
+
+    def send_json(self, status, data, meta=None, headers=None):
+        body = json.dumps({"meta": meta or {"rc": "ok" if status < 400 else "error"}, "data": data}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status, msg):
+        self.send_json(status, [], meta={"rc": "error", "msg": msg})
+
+    def read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return None
+
+    def current_session(self):
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        token = cookie['TOKEN'].value if 'TOKEN' in cookie else None
+        return token, self.controller.session_for(token) if token else None
+
+    def parse_network_path(self):
+        """Split /proxy/network/api/s/<site>/<rest...> into (site, [parts])"""
+        path = self.path.split('?', 1)[0]
+        if not path.startswith(NETWORK_PREFIX):
+            return None, None
+        parts = path[len(NETWORK_PREFIX):].strip('/').split('/')
+        return parts[0], parts[1:]
+
+    def begin(self, key):
+        """Common per-request work: stats, latency, injected errors. Returns False if the request failed."""
+        self.controller.count(key)
+        self.controller.delay()
+        if self.controller.should_fail():
+            self.send_error_json(500, "api.err.Injected")
+            return False
+        return True
+
+    # ---------- routes ----------
+
+    def do_POST(self):
+        body = self.read_json()
+        if self.path == '/__fake/reset':
+            self.controller.reset()
+            return self.send_json(200, [])
+        if self.path != '/api/auth/login':
+            return self.send_error_json(404, "api.err.NotFound")
+        if not self.begin('login'):
+            return
+        result = self.controller.login((body or {}).get('username'), (body or {}).get('password'))
+        if result is None:
+            return self.send_error_json(401, "api.err.Invalid")
+        token, csrf = result
+        self.send_json(200, [], headers={
+            'Set-Cookie': f"TOKEN={token}; Path=/; HttpOnly",
+            'X-Csrf-Token': csrf
+        })
+
+    def do_GET(self):
+        if self.path == '/__fake/stats':
+            with self.controller.lock:
+                stats = json.loads(json.dumps(self.controller.stats))
+            return self.send_json(200, [stats])
+
+        site, parts = self.parse_network_path()
+        if site is None:
+            return self.send_error_json(404, "api.err.NotFound")
+        key = 'GET ' + '/'.join(parts[:2])
+        if not self.begin(key):
+            return
+        _, session = self.current_session()
+        if session is None:
+            with self.controller.lock:
+                self.controller.stats['rejected'] += 1
+            return self.send_error_json(401, "api.err.LoginRequired")
+        if site not in self.controller.sites:
+            return self.send_error_json(400, "api.err.NoSiteContext")
+
+        if parts == ['rest', 'wlanconf']:
+            return self.send_json(200, self.controller.list_wlans(site))
+        if len(parts) == 3 and parts[:2] == ['rest', 'wlanconf']:
+            wlan = self.controller.get_wlan(site, parts[2])
+            if wlan is None:
+                return self.send_error_json(400, "api.err.IdInvalid")
+            return self.send_json(200, [wlan])
+        if parts == ['stat', 'sysinfo']:
+            return self.send_json(200, [{"version": "fake-9.0.0", "hostname": "fake-udr", "uptime": 3600}])
+        return self.send_error_json(404, "api.err.NotFound")
+
+    def do_PUT(self):
+        site, parts = self.parse_network_path()
+        body = self.read_json()
+        if site is None or len(parts) != 3 or parts[:2] != ['rest', 'wlanconf']:
+            return self.send_error_json(404, "api.err.NotFound")
+        if not self.begin('PUT rest/wlanconf'):
+            return
+        _, session = self.current_session()
+        if session is None:
+            with self.controller.lock:
+                self.controller.stats['rejected'] += 1
+            return self.send_error_json(401, "api.err.LoginRequired")
+
+        sent_csrf = self.headers.get('X-Csrf-Token')
+        csrf_mode = self.controller.csrf
+        if (csrf_mode == 'required' and sent_csrf != session['csrf']) or \
+                (csrf_mode == 'optional' and sent_csrf is not None and sent_csrf != session['csrf']):
+            with self.controller.lock:
+                self.controller.stats['rejected'] += 1
+            return self.send_error_json(403, "api.err.InvalidCsrfToken")
+        if body is None:
+            return self.send_error_json(400, "api.err.InvalidPayload")
+        if site not in self.controller.sites:
+            return self.send_error_json(400, "api.err.NoSiteContext")
+
+        wlan = self.controller.update_wlan(site, parts[2], body)
+        if wlan is None:
+            return self.send_error_json(400, "api.err.IdInvalid")
+
+        headers = {}
+        if self.controller.rotate_csrf:
+            with self.controller.lock:
+                session['csrf'] = secrets.token_hex(8)
+            headers['X-Updated-Csrf-Token'] = session['csrf']
+        self.send_json(200, [wlan], headers=headers)
+
+
+def make_server(controller, host="127.0.0.1", port=8443, certfile=None, keyfile=None, verbose=False):
+    """Build a threaded HTTP(S) server for controller; call serve_forever() on it"""
+    handler = type('BoundFakeControllerHandler', (FakeControllerHandler,), {"controller": controller})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    if certfile:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    return server
+
+
+def start_in_thread(controller, host="127.0.0.1", port=0):
+    """
+    Run a fake controller in a background thread (for scripts and benchmarks).
+
+    Returns:
+        tuple: (server, base_url) - pass base_url as the UniFiAPI host,
+               call server.shutdown() when done
+    """
+    server = make_server(controller, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake UniFi controller for offline testing")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8443)
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default='C0,5prings@@@')
+    parser.add_argument('--wlans', help="JSON file with the seed WLAN list (default: the UDR7 in PROJECT_RULES.md)")
+    parser.add_argument('--sites', default='default', help="Comma-separated site names")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Extra random latency, 0..N seconds")
+    parser.add_argument('--apply-delay', type=float, default=0.0, help="Seconds before a rename becomes visible")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument('--csrf', choices=['required', 'optional', 'off'], default='required',
+                        help="CSRF enforcement on writes")
+    parser.add_argument('--rotate-csrf', action='store_true', help="Issue a new CSRF token after every write")
+    parser.add_argument('--session-ttl', type=float, default=7200, help="Seconds before a login expires")
+    parser.add_argument('--seed', type=int, help="Random seed for repeatable fault injection")
+    parser.add_argument('--certfile', help="Serve HTTPS with this certificate")
+    parser.add_argument('--keyfile', help="Private key for --certfile")
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    args = parser.parse_args()
+
+    wlans = None
+    if args.wlans:
+        with open(args.wlans, 'r') as f:
+            wlans = json.load(f)
+
+    controller = FakeController(
+        username=args.username, password=args.password, wlans=wlans, sites=args.sites.split(','),
+        latency=args.latency, jitter=args.jitter, apply_delay=args.apply_delay, error_rate=args.error_rate,
+        csrf=args.csrf, rotate_csrf=args.rotate_csrf, session_ttl=args.session_ttl, seed=args.seed
+    )
+    server = make_server(controller, args.host, args.port, args.certfile, args.keyfile, args.verbose)
+    scheme = "https" if args.certfile else "http"
+    print(f"Fake UniFi controller listening on {scheme}://{args.host}:{server.server_address[1]}")
+    print(f"Sites: {', '.join(controller.site_names)} | latency {args.latency}s | apply delay {args.apply_delay}s "
+          f"| error rate {args.error_rate:.0%} | CSRF {args.csrf}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Event Broker
+
+Server-Sent Events fan-out for the web dashboard. One broker thread calls a
+poll function once a second to detect changes (rotation started/finished,
+lists edited, next SSID staged) and copies each event into a small queue per
+connected browser, so detection costs the same whether one tab or twenty are
+open.
+
+Each event gets an increasing id. Recent events are kept so a browser that
+reconnects with Last-Event-ID gets what it missed; ids start from the
+start-up time in milliseconds, so they keep increasing across restarts.
+"""
+import json
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+# Seconds between checks for changes
+EVENT_POLL_INTERVAL = 1.0
+# Seconds of silence before a keep-alive comment is sent
+EVENT_HEARTBEAT_SECONDS = 15
+# Reconnect delay the browser is told to use (milliseconds)
+EVENT_RETRY_MS = 5000
+# Events kept for Last-Event-ID replay
+EVENT_HISTORY = 100
+# Events queued for one browser before it is disconnected as too slow
+EVENT_QUEUE_SIZE = 100
+
+
+def format_event(event_id, name, data):
+    """One event in text/event-stream format"""
+    return f"id: {event_id}\nevent: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+class EventBroker:
+    """Detects changes on one thread and fans them out to per-client queues"""
+
+    def __init__(self, poll, interval=EVENT_POLL_INTERVAL, history=EVENT_HISTORY):
+        """
+        Args:
+            poll: Called every interval seconds on the broker thread; returns
+                  a list of (event_name, data) tuples for what changed
+            interval: Seconds between polls
+            history: Number of recent events kept for Last-Event-ID replay
+        """
+        self.poll = poll
+        self.interval = interval
+        self.history = deque(maxlen=history)
+        self.clients = set()
+        self.next_id = int(time.time() * 1000)
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self.run, name="event-broker", daemon=True).start()
+
+    def stop(self):
+        self.stopping.set()
+
+    def run(self):
+        while not self.stopping.wait(self.interval):
+            try:
+                events = self.poll()
+            except Exception as e:
+                print(f"[{datetime.now()}] Warning: Dashboard event check failed: {e}")
+                continue
+            for name, data in events:
+                self.publish(name, data)
+
+    def publish(self, name, data):
+        with self.lock:
+            self.next_id += 1
+            message = format_event(self.next_id, name, data)
+            self.history.append((self.next_id, message))
+            for client in list(self.clients):
+                try:
+                    client.put_nowait(message)
+                except queue.Full:
+                    # Too far behind; it reconnects and replays from history
+                    self.clients.discard(client)
+
+    def subscribe(self, last_event_id=None):
+        """
+        Register a client.
+
+        Returns:
+            tuple: (queue, backlog) - backlog holds the stored events after
+                   last_event_id, formatted, oldest first
+        """
+        client = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+        with self.lock:
+            backlog = []
+            if last_event_id is not None:
+                backlog = [message for event_id, message in self.history if event_id > last_event_id]
+            self.clients.add(client)
+        return client, backlog
+
+    def unsubscribe(self, client):
+        with self.lock:
+            self.clients.discard(client)
+
+    def stream(self, last_event_id=None, heartbeat=EVENT_HEARTBEAT_SECONDS):
+        """Generator for one browser's text/event-stream response"""
+        client, backlog = self.subscribe(last_event_id)
+        try:
+            yield f"retry: {EVENT_RETRY_MS}\n\n"
+            for message in backlog:
+                yield message
+            while True:
+                try:
+                    yield client.get(timeout=heartbeat)
+                except queue.Empty:
+                    with self.lock:
+                        if client not in self.clients:
+                            return  # Dropped for falling behind
+                    # A comment line: keeps proxies and NAT from closing the connection
+                    yield ": heartbeat\n\n"
+        finally:
+            self.unsubscribe(client)
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Fleet Rotation
+
+Rotates the SSID on every controller/site listed in an inventory file,
+running the sites concurrently so total wall time is bounded by the slowest
+controller rather than the sum of all of them.
+
+Inventory format (JSON):
+
+    {
+      "defaults": {"max_concurrency": 2, "timeout": 120},
+      "controllers": [
+        {
+          "name": "home",
+          "host": "192.168.102.1",
+          "username": "admin",
+          "password_env": "HOME_UDR_PASSWORD",
+          "max_concurrency": 1,
+          "sites": [
+            {
+              "site": "default",
+              "current_ssid_name": "Guest",
+              "ssid_list_file": "/var/lib/ssid_rotator/fleet/home/ssid_list.json"
+            }
+          ]
+        }
+      ]
+    }
+
+Each site is rotated by a normal SSIDRotator with its own ssid_list.json and
+state.json, so every safety check of the single-site rotator still applies.
+
+With --async the sites run as coroutines on one event loop using the aiohttp
+client from unifi_async.py, sharing a single keep-alive connection pool.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from rotate_ssid import CONFIG, BackoffVerifier, SSIDRotator
+
+DEFAULT_INVENTORY_FILE = "/var/lib/ssid_rotator/fleet.json"
+DEFAULT_FLEET_DIR = "/var/lib/ssid_rotator/fleet"
+
+# Keys a site entry may override on top of the controller and CONFIG defaults
+SITE_CONFIG_KEYS = (
+    "current_ssid_name", "ssid_list_file", "state_file", "wlan_cache_file",
+    "minimal_update_payload", "max_parallel_updates", "request_timeout",
+    "verify_timeout", "verify_initial_delay", "verify_max_delay"
+)
+
+
+def load_inventory(path):
+    """
+    Read the fleet inventory and expand it into one rotation target per site.
+
+    Returns:
+        list: dicts with name, controller, max_concurrency, timeout and the
+              full SSIDRotator config for that site
+    """
+    with open(path, 'r') as f:
+        inventory = json.load(f)
+
+    defaults = inventory.get('defaults', {})
+    targets = []
+
+    for controller in inventory.get('controllers', []):
+        name = controller.get('name') or controller['host']
+        password = controller.get('password')
+        if password is None and controller.get('password_env'):
+            password = os.environ.get(controller['password_env'])
+        if password is None:
+            raise Exception(f"Controller '{name}': no password or password_env set in {path}")
+
+        for site_entry in controller.get('sites', [{"site": "default"}]):
+            site = site_entry.get('site', 'default')
+            site_dir = os.path.join(defaults.get('fleet_dir', DEFAULT_FLEET_DIR), name, site)
+
+            config = dict(CONFIG)
+            config.update({
+                "unifi_host": controller['host'],
+                "username": controller.get('username', CONFIG['username']),
+                "password": password,
+                "site": site,
+                "ssid_list_file": os.path.join(site_dir, "ssid_list.json"),
+                "state_file": os.path.join(site_dir, "state.json"),
+                "validation_cache_file": os.path.join(site_dir, "validation_cache.json"),
+                "wlan_cache_file": None
+            })
+            for key in SITE_CONFIG_KEYS:
+                if key in controller:
+                    config[key] = controller[key]
+                if key in site_entry:
+                    config[key] = site_entry[key]
+
+            targets.append({
+                "name": f"{name}/{site}",
+                "controller": name,
+                "max_concurrency": controller.get('max_concurrency', defaults.get('max_concurrency', 2)),
+                "timeout": site_entry.get('timeout', controller.get('timeout', defaults.get('timeout', 120))),
+                "config": config
+            })
+
+    return targets
+
+
+def rotate_target(target):
+    """Rotate one site and return its result record (never raises)"""
+    result = {"target": target['name'], "status": "error", "ssid": None, "error": None, "seconds": None}
+    start = time.monotonic()
+    try:
+        rotator = SSIDRotator(target['config'])
+        rotator.rotate()
+        state = rotator.load_state()
+        result['ssid'] = rotator.ssid_list[state['current_index']]
+        result['status'] = "success"
+    except Exception as e:
+        print(f"[{datetime.now()}] [{target['name']}] ERROR: {e}")
+        result['error'] = str(e)
+    result['seconds'] = round(time.monotonic() - start, 2)
+    return result
+
+
+def rotate_fleet(targets, max_workers=16):
+    """
+    Rotate every target concurrently.
+
+    At most max_workers sites run at once overall, and at most each
+    controller's max_concurrency run against the same controller. A site
+    that exceeds its timeout is reported as 'still_running' so a slow
+    controller cannot hold up the summary, but its thread is not abandoned:
+    it may still change the SSID and save state.json, so the process waits
+    for it before exiting and logs its late result.
+
+    Returns:
+        list: one result dict per target, in inventory order
+    """
+    global_slots = threading.BoundedSemaphore(max(1, max_workers))
+    controller_slots = {}
+    for target in targets:
+        if target['controller'] not in controller_slots:
+            controller_slots[target['controller']] = threading.BoundedSemaphore(max(1, target['max_concurrency']))
+
+    results = [None] * len(targets)
+    started_at = [None] * len(targets)
+    done = [threading.Event() for _ in targets]
+    results_lock = threading.Lock()
+
+    def worker(i, target):
+        with global_slots, controller_slots[target['controller']]:
+            started_at[i] = time.monotonic()
+            result = rotate_target(target)
+        with results_lock:
+            if results[i] is None:
+                results[i] = result
+            else:
+                # Already reported as still running; the summary has been printed
+                print(f"[{datetime.now()}] [{target['name']}] Finished after its timeout: "
+                      f"{result['status']} ({result['seconds']}s){': ' + result['error'] if result['error'] else ''}")
+            done[i].set()
+
+    # Not daemon threads: the interpreter waits for them at exit, so a site
+    # past its timeout is never killed between its PUT and saving state.json
+    for i, target in enumerate(targets):
+        threading.Thread(target=worker, args=(i, target), name=f"fleet-{target['name']}").start()
+
+    # A site's timeout only starts counting once it gets its concurrency slot
+    while not all(event.is_set() for event in done):
+        now = time.monotonic()
+        with results_lock:
+            for i, target in enumerate(targets):
+                if done[i].is_set() or started_at[i] is None:
+                    continue
+                if now - started_at[i] > target['timeout']:
+                    results[i] = {
+                        "target": target['name'], "status": "still_running", "ssid": None,
+                        "error": f"No result after {target['timeout']}s; still running, result will be logged",
+                        "seconds": round(now - started_at[i], 2)
+                    }
+                    done[i].set()
+        time.sleep(0.1)
+
+    return results
+
+
+async def rotate_site_async(target, connector, timeout=None):
+    """
+    Rotate one site with the async client; same plan and safety checks as SSIDRotator.rotate().
+
+    timeout only covers logging in and reading the site's WLANs. Once the
+    first update is sent the rotation runs to completion (every request and
+    verification has its own timeout), so it is never cancelled between
+    changing the controller and saving state.json.
+
+    Raises:
+        asyncio.TimeoutError: If the site could not be prepared within
+                              timeout; nothing has been changed
+    """
+    from unifi_async import AsyncUniFiAPI
+
+    config = target['config']
+    rotator = SSIDRotator(config)
+    rotator.check_overlap()
+    state = rotator.load_state()
+
+    api = AsyncUniFiAPI(
+        config['unifi_host'], config['username'], config['password'],
+        site=config.get('site', 'default'),
+        connector=connector,
+        timeout=config.get('request_timeout', 10),
+        verifier=BackoffVerifier(
+            timeout=config.get('verify_timeout', 15),
+            initial_delay=config.get('verify_initial_delay', 0.2),
+            max_delay=config.get('verify_max_delay', 2.0)
+        ),
+        session_cache_file=config.get('session_cache_file'),
+        session_max_age=config.get('session_max_age', 6600),
+        minimal_payload=config.get('minimal_update_payload', False)
+    )
+    try:
+        async def prepare():
+            await api.connect()
+            targets = rotator.get_targets(state)
+            # One listing answers discovery and every safety check for this site
+            with api.timings.phase('discover'):
+                index = await api.get_wlan_index()
+            return rotator.build_plan(None, targets, index, api.timings)
+
+        plan = await asyncio.wait_for(prepare(), timeout)
+
+        failures = {}
+        slots = asyncio.Semaphore(max(1, config.get('max_parallel_updates', 4)))
+
+        async def push(step):
+            async with slots:
+                try:
+                    await api.update_ssid(step['target']['state']['wlan_id'], step['next_ssid'])
+                except Exception as e:
+                    failures[step['target']['name']] = e
+
+        await asyncio.gather(*(push(step) for step in plan))
+        api.timings.log(f"[{target['name']}] ")
+        rotator.finish_rotation(state, plan, failures, api.verifications, api.timings)
+    finally:
+        await api.close()
+
+    return rotator.ssid_list[state['current_index']]
+
+
+async def rotate_fleet_async(targets, max_connections=100, max_connections_per_controller=4):
+    """
+    Rotate every target as a coroutine on the running event loop.
+
+    Per-controller max_concurrency behaves as in rotate_fleet(). A site's
+    timeout applies while it logs in and reads its WLANs; a site that times
+    out there is cancelled before anything was changed (see
+    rotate_site_async()).
+    """
+    from unifi_async import make_connector
+
+    connector = make_connector(limit=max_connections, limit_per_host=max_connections_per_controller)
+    controller_slots = {}
+    for target in targets:
+        if target['controller'] not in controller_slots:
+            controller_slots[target['controller']] = asyncio.Semaphore(max(1, target['max_concurrency']))
+
+    async def run(target):
+        result = {"target": target['name'], "status": "error", "ssid": None, "error": None, "seconds": None}
+        async with controller_slots[target['controller']]:
+            start = time.monotonic()
+            try:
+                result['ssid'] = await rotate_site_async(target, connector, target['timeout'])
+                result['status'] = "success"
+            except asyncio.TimeoutError:
+                result['status'] = "timeout"
+                result['error'] = f"Not ready after {target['timeout']}s; nothing was changed"
+            except Exception as e:
+                print(f"[{datetime.now()}] [{target['name']}] ERROR: {e}")
+                result['error'] = str(e)
+            result['seconds'] = round(time.monotonic() - start, 2)
+        return result
+
+    try:
+        return await asyncio.gather(*(run(target) for target in targets))
+    finally:
+        await connector.close()
+
+
+def print_summary(results, elapsed):
+    print(f"[{datetime.now()}] Fleet rotation summary ({elapsed:.1f}s wall time):")
+    for result in results:
+        if result['status'] == 'success':
+            detail = f"now '{result['ssid']}'"
+        else:
+            detail = result['error']
+        print(f"[{datetime.now()}]   {result['status'].upper():13s} {result['target']} ({result['seconds']}s): {detail}")
+    failed = sum(1 for r in results if r['status'] != 'success')
+    print(f"[{datetime.now()}] {len(results) - failed} of {len(results)} sites rotated successfully")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rotate SSIDs on every controller/site in a fleet inventory")
+    parser.add_argument('inventory', nargs='?', default=DEFAULT_INVENTORY_FILE, help="Fleet inventory JSON file")
+    parser.add_argument('--max-workers', type=int, default=16, help="Sites rotated at once across the fleet")
+    parser.add_argument('--summary', help="Also write the per-site results to this JSON file")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="Run sites on one asyncio event loop (requires aiohttp)")
+    parser.add_argument('--max-connections', type=int, default=100,
+                        help="Connection pool size for --async")
+    args = parser.parse_args()
+
+    print(f"[{datetime.now()}] Starting fleet SSID rotation from {args.inventory}...")
+    start = time.monotonic()
+    targets = load_inventory(args.inventory)
+    if args.use_async:
+        results = asyncio.run(rotate_fleet_async(targets, max_connections=args.max_connections))
+    else:
+        results = rotate_fleet(targets, max_workers=args.max_workers)
+    elapsed = time.monotonic() - start
+    print_summary(results, elapsed)
+
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            json.dump({
+                "finished_at": datetime.now().isoformat(),
+                "seconds": round(elapsed, 2),
+                "results": results
+            }, f, indent=2)
+
+    # Sites still running past their timeout are waited for before the
+    # process exits (their threads are not daemons), so none is cut off
+    # between updating the controller and saving its state.json
+    if any(r['status'] == 'still_running' for r in results):
+        print(f"[{datetime.now()}] Waiting for sites that are still running...")
+    sys.exit(0 if all(r['status'] == 'success' for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+JSON File Cache
+
+Read-through cache for the small JSON files the web manager reads on every
+request (ssid_list.json, state.json). A cached value is reused for as long as
+the file's (mtime, size, inode) match the ones it was parsed from, so a
+request costs one stat() instead of an open() and json.load(); any write,
+by the web manager, the rotator or by hand, changes the signature and the
+next read parses the file again.
+
+Callers get their own copy of the cached value, so a request that modifies
+what it loaded (and then fails) can't change what other requests see.
+"""
+import json
+import os
+import threading
+
+
+def _signature(st):
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def copy_json(value):
+    """Copy parsed JSON (dicts, lists and immutable scalars) without json.loads or deepcopy"""
+    if isinstance(value, dict):
+        return {key: copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_json(item) for item in value]
+    return value
+
+
+class JSONFileCache:
+    """Parsed JSON files keyed by path, revalidated by (mtime, size, inode)"""
+
+    def __init__(self):
+        self.entries = {}  # path -> {'signature', 'value', 'derived'}
+        self.lock = threading.Lock()
+
+    def load(self, path):
+        """
+        Load a JSON file through the cache.
+
+        Returns:
+            A copy of the parsed file, or None if it doesn't exist
+
+        Raises:
+            ValueError: If the file is not valid JSON and nothing is cached for it
+        """
+        entry = self._entry(path)
+        return copy_json(entry['value']) if entry else None
+
+    def derive(self, path, name, build):
+        """
+        Return build(parsed file), built once per version of the file.
+
+        The result is shared between callers and must be treated as read-only.
+        Returns None if the file doesn't exist.
+        """
+        entry = self._entry(path)
+        if entry is None:
+            return None
+        with self.lock:
+            if name not in entry['derived']:
+                entry['derived'][name] = build(entry['value'])
+            return entry['derived'][name]
+
+    def write(self, path, value):
+        """Write value to path atomically and cache it without reading it back"""
+        # Unique per thread: request threads may write the same file at once
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(value, f, indent=2)
+            f.flush()
+            # os.replace keeps the inode and mtime, so this is the signature path will have
+            signature = _signature(os.fstat(f.fileno()))
+        os.replace(tmp_path, path)
+        with self.lock:
+            self.entries[path] = {'signature': signature, 'value': copy_json(value), 'derived': {}}
+
+    def invalidate(self, path):
+        with self.lock:
+            self.entries.pop(path, None)
+
+    def _entry(self, path):
+        try:
+            signature = _signature(os.stat(path))
+        except FileNotFoundError:
+            self.invalidate(path)
+            return None
+
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry['signature'] == signature:
+                return entry
+
+        try:
+            with open(path, 'r') as f:
+                # Sign what was actually read, in case the file changed since the stat()
+                signature = _signature(os.fstat(f.fileno()))
+                value = json.load(f)
+        except FileNotFoundError:
+            self.invalidate(path)
+            return None
+        except ValueError:
+            # Caught mid-write (e.g. a file edited in place by hand);
+            # serve the last good version until the write completes
+            if entry is not None:
+                return entry
+            raise
+
+        entry = {'signature': signature, 'value': value, 'derived': {}}
+        with self.lock:
+            self.entries[path] = entry
+        return entry
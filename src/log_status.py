@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Rotation Log Status
+
+Works out how the last rotation went from /var/log/ssid-rotator.log without
+reading the whole log. systemd appends to that file forever, so instead of
+readlines() the log is read backwards from the end in fixed-size blocks,
+stopping at the last "Starting SSID rotator" marker. The cost depends on the
+length of the last run's output, not on the size of the log.
+
+LogIndex goes further for the long-running web manager: it remembers how far
+it has read, parses only newly appended lines into rotation records and keeps
+the latest status ready, so repeated lookups cost one stat() each.
+
+Used by web_manager.py for the dashboard's status banner. Run it directly to
+check a log or to benchmark against readlines():
+
+    python3 log_status.py [LOG_FILE]
+    python3 log_status.py --bench
+"""
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+# Printed by rotate_ssid.py and rotator_daemon.py at the start of every run
+RUN_START_TEXT = 'Starting SSID rotator'
+RUN_START_MARKER = RUN_START_TEXT.encode('utf-8')
+
+# "[2025-12-18 19:46:39.123456] ..." - the prefix every log line is printed with
+TIMESTAMP_RE = re.compile(r'^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)?)\]')
+# rotator_daemon.py says why it is rotating: "Starting SSID rotator (manual)..."
+TRIGGER_RE = re.compile(r'Starting SSID rotator \((\w+)\)')
+
+LOG_BLOCK_SIZE = 8192
+
+# Give up looking for the marker after this much of the tail; a run whose
+# start is further back than this is not "recent" (the old code only looked
+# at the last 200 lines)
+MAX_SCAN_BYTES = 1024 * 1024
+
+# Rotation records LogIndex keeps in memory
+MAX_RECORDS = 50
+
+
+def find_last_run_start(f, end, block_size=LOG_BLOCK_SIZE, max_scan_bytes=MAX_SCAN_BYTES):
+    """
+    Find where the most recent run starts, reading backwards from end.
+
+    Args:
+        f: The log, opened in binary mode
+        end: Byte offset to search back from (normally the file size)
+        block_size: Bytes read per seek
+        max_scan_bytes: Stop looking for the start marker after this many bytes
+
+    Returns:
+        int: Byte offset of the last "Starting SSID rotator" line, or None if
+             no run started within max_scan_bytes of end
+    """
+    position = end
+    buffer = b''
+    while position > 0 and len(buffer) < max_scan_bytes:
+        read_size = min(block_size, position)
+        position -= read_size
+        f.seek(position)
+        block = f.read(read_size)
+        # Only search the new block, plus enough of the old buffer to
+        # catch a marker split across the block boundary
+        search_end = len(block) + len(RUN_START_MARKER) - 1
+        buffer = block + buffer
+        marker = buffer.rfind(RUN_START_MARKER, 0, search_end)
+        if marker != -1:
+            break
+    else:
+        return None
+
+    # Back up to the start of the marker's line (its timestamp may be in
+    # an earlier block)
+    line_start = buffer.rfind(b'\n', 0, marker) + 1
+    while line_start == 0 and position > 0:
+        read_size = min(block_size, position)
+        position -= read_size
+        f.seek(position)
+        buffer = f.read(read_size) + buffer
+        marker += read_size
+        line_start = buffer.rfind(b'\n', 0, marker) + 1
+    return position + line_start
+
+
+def read_last_run(log_file, block_size=LOG_BLOCK_SIZE, max_scan_bytes=MAX_SCAN_BYTES):
+    """
+    Read the log lines of the most recent run, reading backwards from the end.
+
+    Returns:
+        list: Lines from the last "Starting SSID rotator" line to the end of
+              the file, or None if no run started within max_scan_bytes
+    """
+    with open(log_file, 'rb') as f:
+        start = find_last_run_start(f, os.fstat(f.fileno()).st_size, block_size, max_scan_bytes)
+        if start is None:
+            return None
+        f.seek(start)
+        return f.read().decode('utf-8', errors='replace').splitlines()
+
+
+def rotation_status(lines):
+    """
+    Classify the lines of one run.
+
+    Returns: tuple (status, message)
+        status: 'success', 'error', or 'unknown'
+    """
+    rotation_complete = False
+    error_found = False
+    error_msg = None
+
+    for line in lines:
+        if 'Rotation complete' in line or 'Updated SSID from' in line:
+            rotation_complete = True
+        elif 'ERROR:' in line:
+            error_found = True
+            error_msg = line.split('ERROR:', 1)[1].strip()
+
+    if rotation_complete and not error_found:
+        return 'success', 'Last rotation completed successfully'
+    elif error_found:
+        return 'error', f'Last rotation failed: {error_msg[:100] if error_msg else "Unknown error"}'
+    else:
+        return 'unknown', 'Rotation in progress or incomplete'
+
+
+def get_rotation_status(log_file):
+    """
+    Get the status of the last rotation attempt recorded in log_file.
+
+    Returns: tuple (status, message)
+        status: 'success', 'error', or 'unknown'
+        message: descriptive message
+    """
+    if not os.path.exists(log_file):
+        return 'unknown', 'No log file found'
+
+    try:
+        lines = read_last_run(log_file)
+        if lines is None:
+            return 'unknown', 'No recent rotation found in logs'
+        return rotation_status(lines)
+    except Exception as e:
+        return 'unknown', f'Could not read log file: {str(e)}'
+
+
+class LogIndex:
+    """
+    Incremental index of the rotation log.
+
+    Remembers the inode and byte offset it has read up to, parses only bytes
+    appended since into rotation records, and keeps the status of the latest
+    run ready, so a status lookup costs one stat(). A new inode (log rotated)
+    or a file shorter than the offset (truncated) starts the index over from
+    the last run in the file.
+
+    Each record is a dict with 'status' ('in_progress', 'success' or
+    'error'), 'started_at', 'trigger', 'completed_at', 'failed_at', 'error'
+    and 'duration' (seconds from start to completion or failure); fields
+    that don't apply, or whose line had no timestamp, are None.
+    """
+
+    def __init__(self, log_file, max_records=MAX_RECORDS):
+        self.log_file = log_file
+        self.records = deque(maxlen=max_records)
+        self.inode = None
+        self.offset = 0
+        self.lock = threading.Lock()
+        self._status = ('unknown', 'No log file found')
+
+    def status(self):
+        """
+        Status of the last rotation attempt, as get_rotation_status() returns it.
+
+        Returns: tuple (status, message)
+        """
+        with self.lock:
+            try:
+                self._refresh()
+            except Exception as e:
+                return 'unknown', f'Could not read log file: {str(e)}'
+            return self._status
+
+    def version(self):
+        """
+        Where the index has read up to, as a hashable value.
+
+        Changes whenever status(), latest() or history() can have, so callers
+        can cache what they build from them; costs the same stat() as status().
+        """
+        with self.lock:
+            try:
+                self._refresh()
+            except Exception as e:
+                return ('error', str(e))
+            return (self.inode, self.offset)
+
+    def latest(self):
+        """Copy of the most recent rotation record, or None"""
+        with self.lock:
+            try:
+                self._refresh()
+            except Exception:
+                pass
+            return dict(self.records[-1]) if self.records else None
+
+    def history(self):
+        """Copies of the indexed rotation records, oldest first"""
+        with self.lock:
+            try:
+                self._refresh()
+            except Exception:
+                pass
+            return [dict(record) for record in self.records]
+
+    def _refresh(self):
+        try:
+            st = os.stat(self.log_file)
+        except FileNotFoundError:
+            self.inode = None
+            self.offset = 0
+            self.records.clear()
+            self._status = ('unknown', 'No log file found')
+            return
+
+        if st.st_ino == self.inode and st.st_size == self.offset:
+            return
+
+        with open(self.log_file, 'rb') as f:
+            if st.st_ino != self.inode or st.st_size < self.offset:
+                # First look, or the log was rotated or truncated: start from
+                # the last run rather than parsing the whole history
+                self.inode = st.st_ino
+                self.records.clear()
+                start = find_last_run_start(f, st.st_size)
+                if start is None:
+                    # No recent run; skip to the end, but not into the middle of a line
+                    start = max(0, st.st_size - LOG_BLOCK_SIZE)
+                    f.seek(start)
+                    start += f.read(st.st_size - start).rfind(b'\n') + 1
+                self.offset = start
+
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Still being written; read it next time
+                self.offset += len(line)
+                self._parse_line(line.decode('utf-8', errors='replace'))
+
+        self._status = self._record_status()
+
+    def _parse_line(self, line):
+        match = TIMESTAMP_RE.match(line)
+        timestamp = datetime.fromisoformat(match.group(1)) if match else None
+
+        if RUN_START_TEXT in line:
+            trigger = TRIGGER_RE.search(line)
+            self.records.append({
+                'status': 'in_progress',
+                'started_at': timestamp,
+                'trigger': trigger.group(1) if trigger else None,
+                'completed_at': None,
+                'failed_at': None,
+                'error': None,
+                'duration': None
+            })
+            return
+        if not self.records:
+            return
+
+        record = self.records[-1]
+        if 'Rotation complete' in line or 'Updated SSID from' in line:
+            record['completed_at'] = timestamp
+            if record['status'] != 'error':
+                record['status'] = 'success'
+        elif 'ERROR:' in line:
+            record['status'] = 'error'
+            record['failed_at'] = timestamp
+            record['error'] = line.split('ERROR:', 1)[1].strip()
+        else:
+            return
+        if timestamp and record['started_at']:
+            record['duration'] = (timestamp - record['started_at']).total_seconds()
+
+    def _record_status(self):
+        if not self.records:
+            return 'unknown', 'No recent rotation found in logs'
+        record = self.records[-1]
+        if record['status'] == 'error':
+            return 'error', f'Last rotation failed: {record["error"][:100] if record["error"] else "Unknown error"}'
+        if record['status'] == 'success':
+            return 'success', 'Last rotation completed successfully'
+        return 'unknown', 'Rotation in progress or incomplete'
+
+
+def _readlines_status(log_file):
+    """The previous implementation: read the whole log, keep the last 200 lines"""
+    with open(log_file, 'r') as f:
+        lines = f.readlines()[-200:]
+    for i in range(len(lines) - 1, -1, -1):
+        if 'Starting SSID rotator' in lines[i]:
+            return rotation_status(lines[i:])
+    return 'unknown', 'No recent rotation found in logs'
+
+
+def benchmark(sizes_mb=(1, 10, 100), repeat=20):
+    """Time LogIndex and the tail read against readlines() on synthetic logs of growing size"""
+    run = (
+        "[2025-12-18 19:46:39.123456] Starting SSID rotator...\n"
+        "[2025-12-18 19:46:39.234567] Connecting to UniFi controller...\n"
+        "[2025-12-18 19:46:40.345678] Updated SSID from 'Old Name' to 'New Name'\n"
+        "[2025-12-18 19:46:40.456789] Rotation complete\n"
+    ).encode('utf-8')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = os.path.join(tmp, 'ssid-rotator.log')
+        chunk = run * (1024 * 1024 // len(run) + 1)
+        written = 0
+        for size_mb in sizes_mb:
+            with open(log_file, 'ab') as f:
+                while written < size_mb * 1024 * 1024:
+                    f.write(chunk)
+                    written += len(chunk)
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                tail_result = get_rotation_status(log_file)
+            tail = (time.perf_counter() - start) / repeat
+
+            index = LogIndex(log_file)
+            index.status()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                index_result = index.status()
+            indexed = (time.perf_counter() - start) / repeat
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                full_result = _readlines_status(log_file)
+            full = (time.perf_counter() - start) / repeat
+
+            assert tail_result == index_result == full_result, "tail read, index and readlines() disagree"
+            print(f"{written / 1024 / 1024:6.0f} MB log: index {indexed * 1000:8.3f} ms, tail read {tail * 1000:8.3f} ms, "
+                  f"readlines() {full * 1000:8.1f} ms ({full / tail:,.0f}x)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench":
+        benchmark()
+        sys.exit(0)
+
+    log_file = sys.argv[1] if len(sys.argv) > 1 else '/var/log/ssid-rotator.log'
+    status, message = get_rotation_status(log_file)
+    print(f"{status}: {message}")
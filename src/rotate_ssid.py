@@ -3,8 +3,17 @@ import requests
 import urllib3
 import json
 import os
+import stat
+import tempfile
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from ssid_validator import validate_ssid, validate_ssid_list, get_ssid_byte_length
+from ssid_validator import ValidationCache, validate_ssid, get_ssid_byte_length
+from rotation_plan import PRIMARY_TARGET, PlanStore, check_ssid_data
+from ssid_store import ACTIVE, PROTECTED, RESERVE, SSIDStore
 
 # Disable SSL warnings for self-signed cert
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -12,30 +21,413 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 # Configuration
 CONFIG = {
     "unifi_host": "192.168.102.1",  # Your UDR IP
+    "site": "default",  # UniFi Network site name
     "username": "admin",
     "password": "C0,5prings@@@",  # Your actual admin password
     "current_ssid_name": "Fuck the orange turd",  # Initial SSID name to find
     "target_wlan_id": "69363fd4005cd02fa28ab902",  # The WLAN ID to rotate (optional, will auto-discover if not set)
     "state_file": "/var/lib/ssid_rotator/state.json",
-    "ssid_list_file": "/var/lib/ssid_rotator/ssid_list.json"
+    "ssid_list_file": "/var/lib/ssid_rotator/ssid_list.json",
+    "validation_cache_file": "/var/lib/ssid_rotator/validation_cache.json",  # Set to None to always revalidate every SSID
+    "rotation_plan_file": "/var/lib/ssid_rotator/rotation_plan.json",  # Pre-validated lists published by rotation_plan.py
+    "session_cache_file": "/var/lib/ssid_rotator/session.json",  # Set to None to always log in fresh
+    "session_max_age": 6600,  # Seconds to trust a cached login (UniFi OS sessions last ~2 hours)
+    "request_timeout": 10,  # Seconds per API call
+    "verify_timeout": 15,  # Seconds to wait for the controller to report the new SSID
+    "verify_initial_delay": 0.2,  # First wait between verification polls (doubles each poll)
+    "verify_max_delay": 2.0,  # Longest wait between verification polls
+    "wlan_cache_file": None,  # Optional path to remember WLAN fingerprints between runs (drift detection)
+    "minimal_update_payload": False,  # PUT only {"name": ...} instead of the full WLAN config
+    "max_parallel_updates": 4  # Concurrent PUTs when ssid_list.json defines extra rotation_targets
 }
 
+# Fixed rotation interval (PROJECT_RULES.md: 18 hours, non-negotiable)
+ROTATION_INTERVAL_HOURS = 18
+
+# Number of convergence timings kept in state.json
+VERIFICATION_HISTORY_SIZE = 20
+
+def write_json_atomic(path, value):
+    """
+    Write value to path as JSON through a temporary file and os.replace().
+
+    Readers never see a half-written file, and the temporary file is unique
+    (mkstemp), so concurrent writers - threads of one process included -
+    can't clobber each other's. The file keeps its existing permissions.
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o644  # mkstemp's 0600 would hide state.json from the web manager
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(value, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def wlan_fingerprint(config):
+    """
+    Content hash of a WLAN config, ignoring its SSID name.
+
+    Renames made by the rotator therefore don't change the fingerprint; any
+    other change to the WLAN's settings does.
+    """
+    settings = {k: v for k, v in config.items() if k != 'name'}
+    canonical = json.dumps(settings, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+class WLANIndex:
+    """Lookup table over one wlanconf listing, keyed by SSID name and _id"""
+
+    def __init__(self, wlans):
+        self.wlans = wlans
+        self.by_id = {}
+        self.by_name = {}
+        for wlan in wlans:
+            if '_id' in wlan:
+                self.by_id[wlan['_id']] = wlan
+            # Keep the first WLAN for a name, matching the old linear search
+            self.by_name.setdefault(wlan.get('name'), wlan)
+
+    def get_by_name(self, ssid_name):
+        return self.by_name.get(ssid_name)
+
+    def get_by_id(self, wlan_id):
+        return self.by_id.get(wlan_id)
+
+    def names(self):
+        return [w.get('name') for w in self.wlans]
+
+class WLANConfigStore:
+    """On-disk record of WLAN fingerprints from previous runs, used to report config drift"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[{datetime.now()}] Warning: Ignoring unreadable WLAN cache {self.path}: {e}")
+            return {}
+
+    def save(self, entries):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[{datetime.now()}] Warning: Could not write WLAN cache {self.path}: {e}")
+
+class SessionCache:
+    """Persist the UniFi OS auth cookie and CSRF token between runs"""
+
+    # Fleet runs share one cache file between threads; serialise read-modify-write
+    lock = threading.RLock()
+
+    def __init__(self, path, max_age):
+        self.path = path
+        self.max_age = max_age
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {"sessions": {}, "stats": {}}
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[{datetime.now()}] Warning: Ignoring unreadable session cache {self.path}: {e}")
+            return {"sessions": {}, "stats": {}}
+        data.setdefault('sessions', {})
+        data.setdefault('stats', {})
+        return data
+
+    def _write(self, data):
+        # The cache holds a live admin session, so keep it private to the service user
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[{datetime.now()}] Warning: Could not write session cache {self.path}: {e}")
+
+    def load(self, key):
+        """Return the cached session for key, or None if missing or expired"""
+        entry = self._read()['sessions'].get(key)
+        if not entry:
+            return None
+        if entry.get('expires_at', 0) <= time.time():
+            return None
+        return entry
+
+    def save(self, key, cookies, csrf_token):
+        """Store a freshly issued session"""
+        expires_at = time.time() + self.max_age
+        # Never trust the cache beyond the controller's own cookie expiry
+        cookie_expiries = [c['expires'] for c in cookies if c.get('expires')]
+        if cookie_expiries:
+            expires_at = min(expires_at, min(cookie_expiries))
+
+        with self.lock:
+            data = self._read()
+            data['sessions'][key] = {
+                "cookies": cookies,
+                "csrf_token": csrf_token,
+                "created_at": datetime.now().isoformat(),
+                "expires_at": expires_at
+            }
+            self._write(data)
+
+    def update_csrf(self, key, csrf_token):
+        """Record a CSRF token rotated by the controller mid-session"""
+        with self.lock:
+            data = self._read()
+            if key in data['sessions']:
+                data['sessions'][key]['csrf_token'] = csrf_token
+                self._write(data)
+
+    def invalidate(self, key):
+        """Drop a session the controller has rejected"""
+        with self.lock:
+            data = self._read()
+            if data['sessions'].pop(key, None) is not None:
+                self._write(data)
+
+    def record_run(self, key, reused):
+        """Count whether this run skipped login; returns the updated counters"""
+        with self.lock:
+            data = self._read()
+            stats = data['stats'].setdefault(key, {"runs": 0, "logins_skipped": 0, "relogins": 0})
+            stats['runs'] += 1
+            if reused:
+                stats['logins_skipped'] += 1
+            self._write(data)
+            return stats
+
+    def record_relogin(self, key):
+        """Count a cached session that was rejected and replaced"""
+        with self.lock:
+            data = self._read()
+            stats = data['stats'].setdefault(key, {"runs": 0, "logins_skipped": 0, "relogins": 0})
+            stats['relogins'] += 1
+            self._write(data)
+
+class CallTimings:
+    """Duration, status and payload size of every API call, plus wall time per rotation phase"""
+
+    PHASES = ("login", "discover", "validate", "put", "verify")
+
+    def __init__(self):
+        self.calls = []
+        self.phases = {}
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+
+    def record_call(self, method, path, status, seconds, request_bytes, response_bytes):
+        with self.lock:
+            self.calls.append({
+                "method": method,
+                "path": path,
+                "status": status,
+                "seconds": round(seconds, 4),
+                "request_bytes": request_bytes,
+                "response_bytes": response_bytes
+            })
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Add the wall time of the with-block to phase name.
+
+        Phases are summed across threads and a re-login inside another phase
+        is counted in both, so 'total' is measured separately as wall time.
+        """
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            with self.lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def summary(self):
+        """Structured breakdown for state.json"""
+        with self.lock:
+            phases = {name: round(self.phases.get(name, 0.0), 3) for name in self.PHASES}
+            calls = list(self.calls)
+        return {
+            "phases": phases,
+            "total": round(time.monotonic() - self.started, 3),
+            "api_calls": len(calls),
+            "bytes_sent": sum(c['request_bytes'] for c in calls),
+            "bytes_received": sum(c['response_bytes'] for c in calls),
+            "calls": calls
+        }
+
+    def log(self, label=""):
+        summary = self.summary()
+        for call in summary['calls']:
+            print(
+                f"[{datetime.now()}] {label}API {call['method']} {call['path']} -> {call['status']} "
+                f"in {call['seconds'] * 1000:.0f}ms ({call['request_bytes']}B sent, {call['response_bytes']}B received)"
+            )
+        breakdown = " | ".join(f"{name} {seconds:.3f}s" for name, seconds in summary['phases'].items())
+        print(
+            f"[{datetime.now()}] {label}Timing breakdown: {breakdown} | total {summary['total']:.3f}s "
+            f"({summary['api_calls']} API calls)"
+        )
+
+class BackoffVerifier:
+    """Poll until the controller reports the expected SSID, backing off exponentially"""
+
+    def __init__(self, timeout=15.0, initial_delay=0.2, max_delay=2.0, factor=2.0):
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+
+    def wait(self, fetch_name, expected):
+        """
+        Call fetch_name() until it returns expected or the deadline passes.
+
+        The first poll happens immediately, so a fast controller is confirmed
+        without any sleep at all. Request errors while the controller is still
+        applying the change are retried until the deadline.
+
+        Returns:
+            dict: converged (bool), seconds (float), polls (int), last_name (str or None)
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        delay = self.initial_delay
+        polls = 0
+        last_name = None
+
+        while True:
+            polls += 1
+            try:
+                last_name = fetch_name()
+            except requests.RequestException as e:
+                print(f"[{datetime.now()}] Verification poll {polls} failed: {e}")
+            else:
+                if last_name == expected:
+                    return {
+                        "converged": True,
+                        "seconds": round(time.monotonic() - start, 3),
+                        "polls": polls,
+                        "last_name": last_name
+                    }
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return {
+                    "converged": False,
+                    "seconds": round(time.monotonic() - start, 3),
+                    "polls": polls,
+                    "last_name": last_name
+                }
+            time.sleep(min(delay, remaining))
+            delay = min(delay * self.factor, self.max_delay)
+
 class UniFiAPI:
-    def __init__(self, host, username, password):
+    def __init__(self, host, username, password, session_cache_file=None, session_max_age=6600, timeout=10,
+                 verifier=None, wlan_cache_file=None, minimal_payload=False, site="default"):
         self.host = host
-        # UDR7 uses different endpoints for OS vs Network Controller
-        self.os_url = f"https://{host}"  # UniFi OS API (for login)
-        self.network_url = f"https://{host}/proxy/network"  # Network Controller API (for WLAN operations)
+        self.site = site
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        # UDR7 uses different endpoints for OS vs Network Controller.
+        # A host given with a scheme (e.g. "http://127.0.0.1:8443" for fake_unifi_controller.py) is used as-is.
+        base_url = host if '://' in host else f"https://{host}"
+        self.os_url = base_url  # UniFi OS API (for login)
+        self.network_url = f"{base_url}/proxy/network"  # Network Controller API (for WLAN operations)
         self.session = requests.Session()
         self.csrf_token = None
-        self.login(username, password)
+        self.verifier = verifier or BackoffVerifier()
+        self.last_verification = None
+        self.verifications = {}
+        # Serialises re-login when several threads hit an expired session at once
+        self.auth_lock = threading.Lock()
+        self.login_count = 0
+        self.minimal_payload = minimal_payload
+        # WLAN configs read during this run, keyed by _id. Only reads made in
+        # this process are ever served from here.
+        self.wlan_cache = {}
+        self.wlan_store = WLANConfigStore(wlan_cache_file) if wlan_cache_file else None
+        self.known_fingerprints = self.wlan_store.load() if self.wlan_store else {}
+        self.session_key = f"{username}@{host}"
+        self.session_cache = SessionCache(session_cache_file, session_max_age) if session_cache_file else None
+        self.timings = CallTimings()
+
+        with self.timings.phase('login'):
+            self.session_reused = self.restore_session()
+            if not self.session_reused:
+                self.login(username, password)
+
+        if self.session_cache:
+            stats = self.session_cache.record_run(self.session_key, self.session_reused)
+            print(
+                f"[{datetime.now()}] Session cache: login skipped on {stats['logins_skipped']} "
+                f"of {stats['runs']} runs ({stats['relogins']} re-logins after rejection)"
+            )
+    
+    def begin_run(self):
+        """
+        Reset per-rotation state when one client is reused for several rotations.
+
+        The session stays warm; WLAN reads, verification results and timings
+        from the previous rotation are discarded so nothing stale is written back.
+        """
+        self.wlan_cache = {}
+        self.verifications = {}
+        self.last_verification = None
+        self.timings = CallTimings()
+    
+    def restore_session(self):
+        """Reuse a cached login if one is still valid. Returns True on success."""
+        if not self.session_cache:
+            return False
+
+        entry = self.session_cache.load(self.session_key)
+        if entry is None:
+            return False
+
+        for cookie in entry.get('cookies', []):
+            self.session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain', ''), path=cookie.get('path', '/')
+            )
+        self.csrf_token = entry.get('csrf_token')
+        print(f"[{datetime.now()}] Reusing cached session (created {entry.get('created_at')})")
+        return True
     
     def login(self, username, password):
         # Login uses UniFi OS API (no /proxy/network prefix)
         url = f"{self.os_url}/api/auth/login"
         data = {"username": username, "password": password}
-        response = self.session.post(url, json=data, verify=False)
+        self.session.cookies.clear()
+        start = time.monotonic()
+        response = self.session.post(url, json=data, verify=False, timeout=self.timeout)
+        # Credentials are not counted in the payload size
+        self.timings.record_call(
+            'POST', '/api/auth/login', response.status_code, time.monotonic() - start, 0, len(response.content)
+        )
         response.raise_for_status()
+        self.login_count += 1
         
         # Extract CSRF token from response headers (required for write operations)
         self.csrf_token = response.headers.get('X-Csrf-Token') or response.headers.get('x-csrf-token')
@@ -43,55 +435,158 @@ class UniFiAPI:
             print(f"[{datetime.now()}] Logged in successfully (CSRF token acquired)")
         else:
             print(f"[{datetime.now()}] Logged in successfully (no CSRF token found)")
+
+        if self.session_cache:
+            cookies = [
+                {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path, "expires": c.expires}
+                for c in self.session.cookies
+            ]
+            self.session_cache.save(self.session_key, cookies, self.csrf_token)
+    
+    def request(self, method, url, **kwargs):
+        """
+        Send an API request on the current session.
+
+        A 401/403 means the session (possibly restored from cache) is no longer
+        accepted, so log in again and retry the request once.
+        """
+        login_count = self.login_count
+        response = self._send(method, url, **kwargs)
+
+        if response.status_code in (401, 403):
+            with self.auth_lock:
+                # Another thread may already have logged in again while we waited
+                if self.login_count == login_count:
+                    print(f"[{datetime.now()}] Session rejected (HTTP {response.status_code}), logging in again")
+                    if self.session_cache:
+                        self.session_cache.invalidate(self.session_key)
+                        self.session_cache.record_relogin(self.session_key)
+                    with self.timings.phase('login'):
+                        self.login(self.username, self.password)
+            response = self._send(method, url, **kwargs)
+
+        response.raise_for_status()
+        return response
+
+    def _send(self, method, url, **kwargs):
+        headers = dict(kwargs.pop('headers', None) or {})
+        if self.csrf_token and method.upper() != 'GET':
+            headers['X-Csrf-Token'] = self.csrf_token
+
+        start = time.monotonic()
+        response = self.session.request(
+            method, url, headers=headers, verify=False, timeout=self.timeout, **kwargs
+        )
+        request_bytes = len(json.dumps(kwargs['json'])) if kwargs.get('json') is not None else 0
+        self.timings.record_call(
+            method.upper(), url[len(self.os_url):], response.status_code, time.monotonic() - start,
+            request_bytes, len(response.content)
+        )
+
+        # UniFi OS rotates the CSRF token on some responses; keep the cache in step
+        updated_token = response.headers.get('X-Updated-Csrf-Token')
+        if updated_token and updated_token != self.csrf_token:
+            self.csrf_token = updated_token
+            if self.session_cache:
+                self.session_cache.update_csrf(self.session_key, updated_token)
+
+        return response
     
     def get_wlan_configs(self):
         # WLAN operations use Network Controller API (with /proxy/network prefix)
-        url = f"{self.network_url}/api/s/default/rest/wlanconf"
-        response = self.session.get(url, verify=False)
-        return response.json()['data']
+        url = f"{self.network_url}/api/s/{self.site}/rest/wlanconf"
+        response = self.request('GET', url)
+        wlans = response.json()['data']
+        for wlan in wlans:
+            self.cache_wlan(wlan)
+        return wlans
+    
+    def get_wlan_by_id(self, wlan_id, use_cache=False):
+        """
+        Fetch one WLAN config.
+
+        With use_cache=True, a config already read earlier in this run is
+        returned without another request.
+        """
+        if use_cache and wlan_id in self.wlan_cache:
+            return dict(self.wlan_cache[wlan_id])
+
+        url = f"{self.network_url}/api/s/{self.site}/rest/wlanconf/{wlan_id}"
+        response = self.request('GET', url)
+        wlan = response.json()['data'][0]
+        self.cache_wlan(wlan)
+        return wlan
+    
+    def cache_wlan(self, wlan):
+        """Remember a WLAN config read this run and report drift since the last run"""
+        wlan_id = wlan.get('_id')
+        if not wlan_id:
+            return
+        self.wlan_cache[wlan_id] = dict(wlan)
+
+        if self.wlan_store is None:
+            return
+        fingerprint = wlan_fingerprint(wlan)
+        known = self.known_fingerprints.get(wlan_id)
+        if known and known.get('fingerprint') != fingerprint:
+            print(
+                f"[{datetime.now()}] Note: WLAN {wlan_id} settings changed since "
+                f"{known.get('seen_at')} (fingerprint {known.get('fingerprint')} -> {fingerprint})"
+            )
+        self.known_fingerprints[wlan_id] = {
+            "fingerprint": fingerprint,
+            "name": wlan.get('name'),
+            "seen_at": datetime.now().isoformat()
+        }
+    
+    def save_wlan_cache(self):
+        """Persist WLAN fingerprints seen this run (no-op without wlan_cache_file)"""
+        if self.wlan_store is not None:
+            self.wlan_store.save(self.known_fingerprints)
     
-    def get_wlan_by_id(self, wlan_id):
-        url = f"{self.network_url}/api/s/default/rest/wlanconf/{wlan_id}"
-        response = self.session.get(url, verify=False)
-        return response.json()['data'][0]
+    def get_wlan_index(self):
+        """Fetch wlanconf once and index it for repeated lookups"""
+        return WLANIndex(self.get_wlan_configs())
     
     def get_wlan_by_name(self, ssid_name):
-        wlans = self.get_wlan_configs()
-        for wlan in wlans:
-            if wlan.get('name') == ssid_name:
-                return wlan
-        return None
+        return self.get_wlan_index().get_by_name(ssid_name)
     
     def update_ssid(self, wlan_id, new_ssid):
-        url = f"{self.network_url}/api/s/default/rest/wlanconf/{wlan_id}"
+        url = f"{self.network_url}/api/s/{self.site}/rest/wlanconf/{wlan_id}"
         
-        # Get current config
-        current_config = self.get_wlan_by_id(wlan_id)
+        # Get current config (shared with the safety check's read when it ran this session)
+        current_config = self.get_wlan_by_id(wlan_id, use_cache=True)
         
         # Update the SSID name
         old_name = current_config['name']
-        current_config['name'] = new_ssid
+        if self.minimal_payload:
+            payload = {"name": new_ssid}
+        else:
+            payload = current_config
+            payload['name'] = new_ssid
         
-        # Prepare headers with CSRF token (required for write operations)
-        headers = {}
-        if self.csrf_token:
-            headers['X-Csrf-Token'] = self.csrf_token
-        
-        # Send the update
-        response = self.session.put(url, json=current_config, headers=headers, verify=False)
-        response.raise_for_status()
+        # Send the update (request() adds the CSRF token required for write operations)
+        with self.timings.phase('put'):
+            response = self.request('PUT', url, json=payload)
+        # The cached copy no longer reflects the controller; verification re-reads it
+        self.wlan_cache.pop(wlan_id, None)
         
         # Verify the change actually took effect (atomicity check)
-        import time
-        time.sleep(1)  # Brief delay to allow UniFi to apply change
-        updated_wlan = self.get_wlan_by_id(wlan_id)
-        if updated_wlan['name'] != new_ssid:
+        with self.timings.phase('verify'):
+            result = self.verifier.wait(lambda: self.get_wlan_by_id(wlan_id)['name'], new_ssid)
+        self.last_verification = result
+        self.verifications[wlan_id] = result
+        if not result['converged']:
             raise Exception(
                 f"SSID update verification failed: expected '{new_ssid}', "
-                f"but UniFi shows '{updated_wlan['name']}'"
+                f"but UniFi shows '{result['last_name']}' after {result['seconds']:.1f}s "
+                f"({result['polls']} polls)"
             )
         
-        print(f"[{datetime.now()}] Updated SSID from '{old_name}' to '{new_ssid}' (verified)")
+        print(
+            f"[{datetime.now()}] Updated SSID from '{old_name}' to '{new_ssid}' "
+            f"(verified in {result['seconds']:.2f}s, {result['polls']} polls)"
+        )
         return response.json()
 
 class SSIDRotator:
@@ -99,6 +594,8 @@ class SSIDRotator:
         self.config = config
         self.state_file = config['state_file']
         self.ssid_list_file = config['ssid_list_file']
+        self.validation_cache = ValidationCache(config.get('validation_cache_file'))
+        self.plan_store = PlanStore(config.get('rotation_plan_file'))
         self.ensure_dirs()
         self.load_ssid_list()
     
@@ -113,8 +610,36 @@ class SSIDRotator:
         if not os.path.exists(self.ssid_list_file):
             raise Exception(f"SSID list file not found: {self.ssid_list_file}")
 
-        with open(self.ssid_list_file, 'r') as f:
-            data = json.load(f)
+        # A long-running process (rotator_daemon.py) keeps the validated lists
+        # between rotations and only reloads when the file has changed
+        st = os.stat(self.ssid_list_file)
+        signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if signature == getattr(self, 'loaded_signature', None):
+            print(f"[{datetime.now()}] SSID list unchanged since last load, reusing validated lists")
+            return
+
+        # The file watcher (rotation_plan.py) may already have validated this exact file
+        plan = self.plan_store.load_current(self.ssid_list_file, list(signature))
+        if plan and plan['valid']:
+            self.ssid_list = plan['active_rotation']
+            self.reserve_pool = plan['reserve_pool']
+            self.protected_ssids = plan['protected_ssids']
+            self.extra_targets = plan['rotation_targets']
+            self.loaded_signature = signature
+            print(f"[{datetime.now()}] Using pre-validated rotation plan (compiled {plan['compiled_at']})")
+            self.log_loaded_lists()
+            return
+
+        with open(self.ssid_list_file, 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw.decode('utf-8'))
+
+        # Content that already passed validation needs no per-SSID checks;
+        # otherwise only SSIDs not seen before are actually validated
+        cache = self.validation_cache
+        cache.hits = cache.misses = 0
+        digest = cache.content_hash(raw)
+        file_known_valid = cache.is_file_valid(digest)
 
         # Load active rotation list (this is what gets rotated)
         self.ssid_list = data.get('active_rotation', [])
@@ -125,52 +650,63 @@ class SSIDRotator:
         # Load protected SSIDs
         self.protected_ssids = data.get('protected_ssids', [])
 
+        # Additional WLANs rotated in the same run (multi-target mode)
+        self.extra_targets = data.get('rotation_targets', [])
+
         # Basic validation
         if not self.ssid_list:
             raise Exception("Active rotation list is empty - add SSIDs before rotating")
 
-        if len(self.ssid_list) < 2:
-            print(f"[{datetime.now()}] Warning: Only 1 SSID in active rotation - rotation will have no effect")
-
-        # Check for duplicates in active rotation
-        if len(self.ssid_list) != len(set(self.ssid_list)):
-            print(f"[{datetime.now()}] Warning: Duplicate SSIDs in active rotation")
-
         # SSID name validation - check all lists
-        validation_errors = []
-
-        # Validate active rotation SSIDs
-        all_valid, errors = validate_ssid_list(self.ssid_list, "Active rotation", strict=True)
-        if not all_valid:
-            validation_errors.extend(errors)
-
-        # Validate reserve pool SSIDs
-        all_valid, errors = validate_ssid_list(self.reserve_pool, "Reserve pool", strict=True)
-        if not all_valid:
-            validation_errors.extend(errors)
-
-        # Validate protected SSIDs (less strict since we don't control them)
-        all_valid, errors = validate_ssid_list(self.protected_ssids, "Protected SSIDs", strict=False)
-        if not all_valid:
-            validation_errors.extend(errors)
+        validation_errors = check_ssid_data(data, cache, skip_ssid_checks=file_known_valid)
 
         # If there are validation errors, log them and raise exception
         if validation_errors:
             print(f"[{datetime.now()}] SSID VALIDATION ERRORS:")
             for error in validation_errors:
                 print(f"[{datetime.now()}]   - {error}")
+            cache.save()
             raise Exception(
                 f"SSID validation failed with {len(validation_errors)} error(s). "
                 f"Please fix invalid SSID names in {self.ssid_list_file}. "
                 f"See log for details."
             )
 
+        self.loaded_signature = signature
+        if file_known_valid:
+            print(f"[{datetime.now()}] SSID list content already validated, skipped SSID checks")
+        else:
+            cache.mark_file_valid(digest)
+            if cache.hits:
+                print(
+                    f"[{datetime.now()}] Validated {cache.misses} new SSIDs "
+                    f"({cache.hits} unchanged SSIDs reused from validation cache)"
+                )
+        cache.save()
+        self.log_loaded_lists()
+
+    def log_loaded_lists(self):
+        """Index the loaded lists, log them and warn about lists that make rotation pointless"""
+        self.store = SSIDStore({ACTIVE: self.ssid_list, RESERVE: self.reserve_pool, PROTECTED: self.protected_ssids})
+
+        if len(self.ssid_list) < 2:
+            print(f"[{datetime.now()}] Warning: Only 1 SSID in active rotation - rotation will have no effect")
+
+        # Duplicates and names in more than one list (protected overlap is refused by check_overlap)
+        for conflict in self.store.describe_conflicts():
+            print(f"[{datetime.now()}] Warning: {conflict}")
+
         # Calculate cycle time
-        cycle_days = (len(self.ssid_list) * 18) / 24
+        cycle_days = (len(self.ssid_list) * ROTATION_INTERVAL_HOURS) / 24
 
         print(f"[{datetime.now()}] Loaded {len(self.ssid_list)} SSIDs in active rotation ({cycle_days:.1f} days per cycle)")
         print(f"[{datetime.now()}] Reserve pool contains {len(self.reserve_pool)} SSIDs")
         print(f"[{datetime.now()}] Protected SSIDs: {', '.join(self.protected_ssids)}")
+        if self.extra_targets:
+            print(
+                f"[{datetime.now()}] Additional rotation targets: "
+                f"{', '.join(t['name'] for t in self.extra_targets)}"
+            )
 
     
     def load_state(self):
@@ -182,21 +718,108 @@ class SSIDRotator:
     
     def save_state(self, state):
         """Save the rotation state"""
-        with open(self.state_file, 'w') as f:
-            json.dump(state, f, indent=2)
+        # An interrupted save never leaves state.json truncated, and the
+        # daemon's timer and manual rotations can't share a temporary file
+        write_json_atomic(self.state_file, state)
     
-    def get_next_ssid(self, current_index):
+    def record_verification(self, state, result, label=""):
+        """Keep recent controller convergence times in the state file for tuning verify_timeout"""
+        if not result:
+            return
+        history = state.get('verification_history', [])
+        history.append(result['seconds'])
+        history = history[-VERIFICATION_HISTORY_SIZE:]
+        state['verification_history'] = history
+        state['last_verification'] = {"seconds": result['seconds'], "polls": result['polls']}
+        print(
+            f"[{datetime.now()}] {label}Controller convergence over last {len(history)} rotations: "
+            f"avg {sum(history) / len(history):.2f}s, max {max(history):.2f}s "
+            f"(verify_timeout {self.config.get('verify_timeout', 15)}s)"
+        )
+    
+    def get_next_ssid(self, current_index, ssid_list=None):
         """Get the next SSID in the rotation"""
-        next_index = (current_index + 1) % len(self.ssid_list)
-        return self.ssid_list[next_index], next_index
+        ssid_list = self.ssid_list if ssid_list is None else ssid_list
+        next_index = (current_index + 1) % len(ssid_list)
+        return ssid_list[next_index], next_index
     
     def is_protected_ssid(self, ssid_name):
         """Check if an SSID is in the protected list"""
-        return ssid_name in self.protected_ssids
+        return self.store.in_list(ssid_name, PROTECTED)
+    
+    def check_overlap(self):
+        """Refuse to run if any rotation list shares names with the protected list"""
+        for target in [{"name": PRIMARY_TARGET, "active_rotation": self.ssid_list}] + self.extra_targets:
+            overlap = {name for name in target['active_rotation'] if self.store.in_list(name, PROTECTED)}
+            if overlap:
+                raise Exception(
+                    f"CONFIGURATION ERROR: The following SSIDs appear in both protected and rotation lists: {overlap}"
+                    + ("" if target['name'] == PRIMARY_TARGET else f" (target '{target['name']}')")
+                )
+    
+    def get_targets(self, state):
+        """
+        Build the list of WLANs to rotate this run.
+
+        The primary target keeps its position at the top level of state.json,
+        so single-WLAN installs are unchanged. Each entry in rotation_targets
+        gets its own wlan_id and current_index under state['targets'].
+        """
+        targets = [{
+            "name": PRIMARY_TARGET,
+            "ssid_list": self.ssid_list,
+            "current_ssid_name": self.config['current_ssid_name'],
+            "state": state
+        }]
+        if not self.extra_targets:
+            return targets
+
+        target_states = state.setdefault('targets', {})
+        for target in self.extra_targets:
+            target_state = target_states.setdefault(target['name'], {"current_index": 0, "wlan_id": None})
+            # A wlan_id pinned in ssid_list.json always wins over a discovered one
+            if target.get('wlan_id'):
+                target_state['wlan_id'] = target['wlan_id']
+            targets.append({
+                "name": target['name'],
+                "ssid_list": target['active_rotation'],
+                "current_ssid_name": target.get('current_ssid_name'),
+                "state": target_state
+            })
+        return targets
+    
+    def connect(self):
+        """Log in to the UniFi controller"""
+        return UniFiAPI(
+            self.config['unifi_host'],
+            self.config['username'],
+            self.config['password'],
+            session_cache_file=self.config.get('session_cache_file'),
+            session_max_age=self.config.get('session_max_age', 6600),
+            timeout=self.config.get('request_timeout', 10),
+            verifier=BackoffVerifier(
+                timeout=self.config.get('verify_timeout', 15),
+                initial_delay=self.config.get('verify_initial_delay', 0.2),
+                max_delay=self.config.get('verify_max_delay', 2.0)
+            ),
+            wlan_cache_file=self.config.get('wlan_cache_file'),
+            minimal_payload=self.config.get('minimal_update_payload', False),
+            site=self.config.get('site', 'default')
+        )
     
-    def validate_target_wlan(self, api, wlan_id):
-        """Ensure the target WLAN is not a protected SSID"""
-        wlan = api.get_wlan_by_id(wlan_id)
+    def validate_target_wlan(self, api, wlan_id, index=None):
+        """
+        Ensure the target WLAN is not a protected SSID.
+
+        When an index from this run's wlanconf listing is given, the check is
+        answered from it instead of fetching the WLAN again.
+        """
+        if index is not None:
+            wlan = index.get_by_id(wlan_id)
+            if wlan is None:
+                raise Exception(f"SAFETY CHECK FAILED: WLAN ID {wlan_id} no longer exists on the controller.")
+        else:
+            wlan = api.get_wlan_by_id(wlan_id)
         current_name = wlan['name']
         
         if self.is_protected_ssid(current_name):
@@ -209,28 +832,34 @@ class SSIDRotator:
         print(f"[{datetime.now()}] Safety check passed: '{current_name}' is not a protected SSID")
         return True
     
-    def discover_wlan_id(self, api):
+    def discover_wlan_id(self, api, index=None, target=None):
         """Find the WLAN ID for the target SSID"""
         print(f"[{datetime.now()}] Discovering WLAN ID...")
         
+        current_ssid_name = target['current_ssid_name'] if target else self.config['current_ssid_name']
+        ssid_list = target['ssid_list'] if target else self.ssid_list
+        
+        # One wlanconf fetch answers every candidate lookup below
+        if index is None:
+            index = api.get_wlan_index()
+        
         # First try the configured name
-        wlan = api.get_wlan_by_name(self.config['current_ssid_name'])
+        wlan = index.get_by_name(current_ssid_name) if current_ssid_name else None
         
         # If not found, try any name in the rotation list
         if wlan is None:
-            print(f"[{datetime.now()}] '{self.config['current_ssid_name']}' not found, checking rotation list...")
-            for ssid in self.ssid_list:
-                wlan = api.get_wlan_by_name(ssid)
+            print(f"[{datetime.now()}] '{current_ssid_name}' not found, checking rotation list...")
+            for ssid in ssid_list:
+                wlan = index.get_by_name(ssid)
                 if wlan:
                     print(f"[{datetime.now()}] Found WLAN with name '{ssid}'")
                     break
         
         if wlan is None:
             # List all available SSIDs for debugging
-            all_wlans = api.get_wlan_configs()
-            available_ssids = [w['name'] for w in all_wlans]
+            available_ssids = index.names()
             raise Exception(
-                f"Could not find WLAN with name '{self.config['current_ssid_name']}' "
+                f"Could not find WLAN with name '{current_ssid_name}' "
                 f"or any from the rotation list. Available SSIDs: {', '.join(available_ssids)}"
             )
         
@@ -245,56 +874,149 @@ class SSIDRotator:
         print(f"[{datetime.now()}] Found WLAN ID: {wlan['_id']} (current name: '{wlan['name']}')")
         return wlan['_id']
     
-    def rotate(self):
-        """Perform the SSID rotation"""
-        # Reload SSID list (in case it was updated)
-        self.load_ssid_list()
-        
-        # Validation: check for overlap
-        overlap = set(self.protected_ssids) & set(self.ssid_list)
-        if overlap:
-            raise Exception(
-                f"CONFIGURATION ERROR: The following SSIDs appear in both protected and rotation lists: {overlap}"
+    def apply_updates(self, api, plan):
+        """
+        Push every planned rename, running up to max_parallel_updates PUTs at once.
+
+        Returns:
+            dict: target name -> exception raised by its update (only failed targets)
+        """
+        if len(plan) == 1:
+            step = plan[0]
+            api.update_ssid(step['target']['state']['wlan_id'], step['next_ssid'])
+            return {}
+
+        workers = max(1, min(self.config.get('max_parallel_updates', 4), len(plan)))
+        failures = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                (step, executor.submit(api.update_ssid, step['target']['state']['wlan_id'], step['next_ssid']))
+                for step in plan
+            ]
+            for step, future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"[{datetime.now()}] [{step['target']['name']}] Update failed: {e}")
+                    failures[step['target']['name']] = e
+        return failures
+    
+    def build_plan(self, api, targets, index=None, timings=None):
+        """
+        Resolve, safety-check and pick the next SSID for every target.
+
+        Discovery and the safety checks are answered from index when one is
+        given; api is only used for lookups the index cannot answer.
+
+        Returns:
+            list: one step dict (target, next_ssid, next_index) per target
+        """
+        timings = timings or CallTimings()
+        plan = []
+        for target in targets:
+            # Get WLAN ID if not already stored
+            if target['state'].get('wlan_id') is None:
+                with timings.phase('discover'):
+                    target['state']['wlan_id'] = self.discover_wlan_id(
+                        api, index, None if target['name'] == PRIMARY_TARGET else target
+                    )
+            
+            # CRITICAL: Validate that we're not about to modify a protected SSID
+            with timings.phase('validate'):
+                self.validate_target_wlan(api, target['state']['wlan_id'], index)
+            
+            # Get next SSID
+            next_ssid, next_index = self.get_next_ssid(target['state'].get('current_index', 0), target['ssid_list'])
+            
+            # Additional safety check: ensure next SSID is not protected
+            if self.is_protected_ssid(next_ssid):
+                raise Exception(
+                    f"SAFETY CHECK FAILED: Next SSID '{next_ssid}' is in the protected list."
+                )
+            
+            label = "" if len(targets) == 1 else f"[{target['name']}] "
+            print(
+                f"[{datetime.now()}] {label}Rotating to SSID #{next_index + 1}/{len(target['ssid_list'])}: {next_ssid}"
             )
+            plan.append({"target": target, "next_ssid": next_ssid, "next_index": next_index})
         
-        # Load state
-        state = self.load_state()
-        
-        # Connect to UniFi
-        api = UniFiAPI(
-            self.config['unifi_host'],
-            self.config['username'],
-            self.config['password']
-        )
-        
-        # Get WLAN ID if not already stored
-        if state.get('wlan_id') is None:
-            state['wlan_id'] = self.discover_wlan_id(api)
+        # Two targets must never point at the same WLAN
+        wlan_ids = [step['target']['state']['wlan_id'] for step in plan]
+        if len(wlan_ids) != len(set(wlan_ids)):
+            raise Exception("CONFIGURATION ERROR: Two rotation targets resolve to the same WLAN ID")
         
-        # CRITICAL: Validate that we're not about to modify a protected SSID
-        self.validate_target_wlan(api, state['wlan_id'])
-        
-        # Get next SSID
-        next_ssid, next_index = self.get_next_ssid(state['current_index'])
+        return plan
+    
+    def finish_rotation(self, state, plan, failures, verifications, timings=None):
+        """Record successful targets (and the timing breakdown) in state.json; raise if any target failed"""
+        if timings is not None:
+            state['last_rotation_timings'] = timings.summary()
+        # Update and save state for every target that succeeded
+        for step in plan:
+            if step['target']['name'] in failures:
+                continue
+            target_state = step['target']['state']
+            target_state['current_index'] = step['next_index']
+            target_state['last_rotation'] = datetime.now().isoformat()
+            self.record_verification(
+                target_state, verifications.get(target_state['wlan_id']),
+                "" if len(plan) == 1 else f"[{step['target']['name']}] "
+            )
+        self.save_state(state)
         
-        # Additional safety check: ensure next SSID is not protected
-        if self.is_protected_ssid(next_ssid):
+        if failures:
             raise Exception(
-                f"SAFETY CHECK FAILED: Next SSID '{next_ssid}' is in the protected list."
+                f"{len(failures)} of {len(plan)} rotation target(s) failed: "
+                + "; ".join(f"{name}: {error}" for name, error in failures.items())
             )
         
-        print(f"[{datetime.now()}] Rotating to SSID #{next_index + 1}/{len(self.ssid_list)}: {next_ssid}")
+        for step in plan:
+            ssid_list = step['target']['ssid_list']
+            next_ssid_preview = ssid_list[(step['next_index'] + 1) % len(ssid_list)]
+            label = "" if len(plan) == 1 else f"[{step['target']['name']}] "
+            print(f"[{datetime.now()}] {label}Rotation complete. Next rotation will use: {next_ssid_preview}")
+    
+    def rotate(self, api=None):
+        """
+        Perform the SSID rotation.
+
+        A long-running caller can pass the UniFiAPI from a previous rotation
+        to reuse its warm session; a new one is connected otherwise.
+        """
+        # Reload SSID list (in case it was updated)
+        self.load_ssid_list()
         
-        # Update the SSID
-        api.update_ssid(state['wlan_id'], next_ssid)
+        # Validation: check for overlap
+        self.check_overlap()
         
-        # Update and save state
-        state['current_index'] = next_index
-        state['last_rotation'] = datetime.now().isoformat()
-        self.save_state(state)
+        # Load state
+        state = self.load_state()
+        
+        # Connect to UniFi (one login shared by every target)
+        if api is None:
+            api = self.connect()
+        else:
+            api.begin_run()
+        targets = self.get_targets(state)
         
-        next_ssid_preview = self.ssid_list[(next_index + 1) % len(self.ssid_list)]
-        print(f"[{datetime.now()}] Rotation complete. Next rotation will use: {next_ssid_preview}")
+        try:
+            # Discovery and the safety checks share a single wlanconf listing
+            # whenever there is more than one WLAN or an ID still to discover
+            index = None
+            if len(targets) > 1 or any(t['state'].get('wlan_id') is None for t in targets):
+                with api.timings.phase('discover'):
+                    index = api.get_wlan_index()
+            
+            plan = self.build_plan(api, targets, index, api.timings)
+            
+            # Update the SSIDs
+            failures = self.apply_updates(api, plan)
+            
+            api.save_wlan_cache()
+            self.finish_rotation(state, plan, failures, api.verifications, api.timings)
+        finally:
+            # Logged on failure too, so a slow phase is visible even when a rotation errors out
+            api.timings.log()
 
 def main():
     print(f"[{datetime.now()}] Starting SSID rotator...")
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Rotation Plan Compiler
+
+Validates ssid_list.json as soon as it changes, instead of 18 hours later
+when the scheduled rotation reads it, and publishes the result as a compiled
+rotation plan (rotation_plan.json):
+
+- valid plans carry the parsed, validated lists, so SSIDRotator can start a
+  rotation without parsing or validating anything;
+- invalid plans carry the validation errors, so the web dashboard can show
+  them straight after the bad edit.
+
+A plan is only used while the source file's (mtime, size, inode) still match
+the ones it was compiled from; otherwise the rotator validates the file
+itself exactly as before.
+
+The watcher uses inotify when available and falls back to polling. The web
+manager and the rotator daemon both run one; it can also be run on its own:
+
+    python3 rotation_plan.py          # compile once and print the result
+    python3 rotation_plan.py --watch  # keep recompiling on every change
+"""
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import threading
+import time
+from datetime import datetime
+
+from ssid_validator import VALIDATION_RULES_VERSION, ValidationCache, validate_ssid_list
+
+# Bump when the plan layout changes; older published plans are then ignored
+ROTATION_PLAN_VERSION = 1
+
+# Name of the WLAN configured by CONFIG/active_rotation (its state stays at the top level of state.json)
+PRIMARY_TARGET = "primary"
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct('iIII')
+
+
+def file_signature(path):
+    """(mtime_ns, size, inode) of path, or None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def check_ssid_data(data, cache=None, skip_ssid_checks=False):
+    """
+    Validate the SSID names and rotation targets of a parsed ssid_list.json.
+
+    Args:
+        data (dict): Parsed ssid_list.json
+        cache (ValidationCache): Optional cache of per-SSID results
+        skip_ssid_checks (bool): True if this exact content already passed validation
+
+    Returns:
+        list: Error messages (empty if valid)
+    """
+    def check_list(ssid_list, list_name, strict):
+        if skip_ssid_checks:
+            return True, []
+        return validate_ssid_list(ssid_list, list_name, strict=strict, cache=cache)
+
+    validation_errors = []
+
+    # Validate active rotation SSIDs
+    all_valid, errors = check_list(data.get('active_rotation', []), "Active rotation", True)
+    if not all_valid:
+        validation_errors.extend(errors)
+
+    # Validate reserve pool SSIDs
+    all_valid, errors = check_list(data.get('reserve_pool', []), "Reserve pool", True)
+    if not all_valid:
+        validation_errors.extend(errors)
+
+    # Validate protected SSIDs (less strict since we don't control them)
+    all_valid, errors = check_list(data.get('protected_ssids', []), "Protected SSIDs", False)
+    if not all_valid:
+        validation_errors.extend(errors)
+
+    # Additional WLANs rotated in the same run (multi-target mode)
+    target_names = {PRIMARY_TARGET}
+    for i, target in enumerate(data.get('rotation_targets', [])):
+        name = target.get('name')
+        if not name or name in target_names:
+            validation_errors.append(f"rotation_targets[{i}]: each target needs a unique 'name'")
+            continue
+        target_names.add(name)
+        if not target.get('active_rotation'):
+            validation_errors.append(f"Target '{name}': active rotation list is empty")
+            continue
+        all_valid, errors = check_list(target['active_rotation'], f"Target '{name}' active rotation", True)
+        if not all_valid:
+            validation_errors.extend(errors)
+
+    return validation_errors
+
+
+def compile_plan(ssid_list_file, cache=None):
+    """
+    Read, parse and validate ssid_list_file into a rotation plan.
+
+    Never raises for bad content: parse and validation problems are returned
+    in the plan's 'errors' with 'valid' set to False.
+    """
+    plan = {
+        "plan_version": ROTATION_PLAN_VERSION,
+        "rules_version": VALIDATION_RULES_VERSION,
+        "source_file": os.path.abspath(ssid_list_file),
+        "source_signature": None,
+        "source_hash": None,
+        "compiled_at": datetime.now().isoformat(),
+        "valid": False,
+        "errors": []
+    }
+
+    # Retry if the file is replaced or rewritten while we read it
+    for attempt in range(3):
+        signature = file_signature(ssid_list_file)
+        if signature is None:
+            plan['errors'] = [f"SSID list file not found: {ssid_list_file}"]
+            return plan
+        with open(ssid_list_file, 'rb') as f:
+            raw = f.read()
+        if file_signature(ssid_list_file) == signature:
+            break
+
+    plan['source_signature'] = signature
+    plan['source_hash'] = ValidationCache.content_hash(raw)
+
+    try:
+        data = json.loads(raw.decode('utf-8'))
+    except ValueError as e:
+        plan['errors'] = [f"ssid_list.json is not valid JSON: {e}"]
+        return plan
+
+    errors = []
+    if not data.get('active_rotation'):
+        errors.append("Active rotation list is empty - add SSIDs before rotating")
+
+    skip = cache is not None and cache.is_file_valid(plan['source_hash'])
+    errors.extend(check_ssid_data(data, cache, skip_ssid_checks=skip))
+
+    plan['errors'] = errors
+    plan['valid'] = not errors
+    if plan['valid'] and cache is not None:
+        cache.mark_file_valid(plan['source_hash'])
+
+    plan.update({
+        "active_rotation": data.get('active_rotation', []),
+        "reserve_pool": data.get('reserve_pool', []),
+        "protected_ssids": data.get('protected_ssids', []),
+        "rotation_targets": data.get('rotation_targets', [])
+    })
+    return plan
+
+
+class PlanStore:
+    """Published rotation plan on disk (written atomically, read by the rotator and web UI)"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load_current(self, ssid_list_file, signature=None):
+        """
+        Return the published plan if it was compiled from the file as it is now
+        (same signature and same content hash).
+
+        Args:
+            ssid_list_file (str): Source file the plan must have been compiled from
+            signature (list): Current file_signature(), if the caller already has it
+        """
+        plan = self.load()
+        if not plan:
+            return None
+        if plan.get('plan_version') != ROTATION_PLAN_VERSION or plan.get('rules_version') != VALIDATION_RULES_VERSION:
+            return None
+        if plan.get('source_file') != os.path.abspath(ssid_list_file):
+            return None
+        if signature is None:
+            signature = file_signature(ssid_list_file)
+        if signature is None or plan.get('source_signature') != list(signature):
+            return None
+        # A matching signature can still hide an edit (same size within the
+        # filesystem's mtime granularity, or a restored mtime), so also check
+        # the content the plan was compiled from
+        try:
+            with open(ssid_list_file, 'rb') as f:
+                raw = f.read()
+        except OSError:
+            return None
+        if plan.get('source_hash') != ValidationCache.content_hash(raw):
+            return None
+        return plan
+
+    def publish(self, plan):
+        current = self.load()
+        if current and current.get('source_signature') == plan['source_signature'] \
+                and current.get('source_hash') == plan['source_hash'] \
+                and current.get('plan_version') == plan['plan_version']:
+            return False  # Already published (e.g. by the other watcher process)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(plan, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[{datetime.now()}] Warning: Could not publish rotation plan {self.path}: {e}")
+            return False
+        return True
+
+
+class FileWatcher:
+    """
+    Call on_change() whenever a file's contents change.
+
+    Watches the file's directory with inotify so atomic replaces (rename over
+    the file) are seen as well as in-place writes. Falls back to polling the
+    file's signature when inotify is unavailable.
+    """
+
+    def __init__(self, path, on_change, poll_interval=2.0, debounce=0.25):
+        self.path = os.path.abspath(path)
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.stopping = threading.Event()
+        self.thread = None
+        self.mode = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="ssid-list-watcher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+
+    def run(self):
+        fd = self.open_inotify()
+        if fd is None:
+            self.mode = "polling"
+            self.run_polling()
+        else:
+            self.mode = "inotify"
+            try:
+                self.run_inotify(fd)
+            finally:
+                os.close(fd)
+
+    def open_inotify(self):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0:
+                return None
+            mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+            if libc.inotify_add_watch(fd, os.path.dirname(self.path).encode(), mask) < 0:
+                os.close(fd)
+                return None
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def read_events(self, fd):
+        """Drain pending inotify events; True if any concern the watched file"""
+        name = os.path.basename(self.path).encode()
+        relevant = False
+        while True:
+            try:
+                buf = os.read(fd, 65536)
+            except BlockingIOError:
+                return relevant
+            offset = 0
+            while offset < len(buf):
+                _, _, _, length = INOTIFY_EVENT.unpack_from(buf, offset)
+                offset += INOTIFY_EVENT.size
+                if buf[offset:offset + length].rstrip(b'\0') == name:
+                    relevant = True
+                offset += length
+
+    def run_inotify(self, fd):
+        last_signature = file_signature(self.path)
+        while not self.stopping.is_set():
+            ready, _, _ = select.select([fd], [], [], 1.0)
+            if not ready or not self.read_events(fd):
+                continue
+            # Editors and the web manager write in several steps; wait for them to settle
+            while select.select([fd], [], [], self.debounce)[0]:
+                self.read_events(fd)
+            signature = file_signature(self.path)
+            if signature != last_signature:
+                last_signature = signature
+                self.notify()
+
+    def run_polling(self):
+        last_signature = file_signature(self.path)
+        while not self.stopping.wait(self.poll_interval):
+            signature = file_signature(self.path)
+            if signature != last_signature:
+                last_signature = signature
+                self.notify()
+
+    def notify(self):
+        try:
+            self.on_change()
+        except Exception as e:
+            print(f"[{datetime.now()}] Warning: Rotation plan compile failed: {e}")
+
+
+class PlanCompiler:
+    """Keeps rotation_plan.json in step with ssid_list.json"""
+
+    def __init__(self, ssid_list_file, plan_file, validation_cache_file=None):
+        self.ssid_list_file = ssid_list_file
+        self.store = PlanStore(plan_file)
+        self.cache = ValidationCache(validation_cache_file)
+        self.lock = threading.Lock()
+        self.latest = None
+        self.watcher = None
+
+    def compile_and_publish(self):
+        """Compile the current file (unless already compiled) and publish the plan"""
+        with self.lock:
+            signature = file_signature(self.ssid_list_file)
+            if self.latest and self.latest.get('source_signature') == signature:
+                return self.latest
+
+            plan = compile_plan(self.ssid_list_file, self.cache)
+            self.cache.save()
+            self.latest = plan
+            if not self.store.publish(plan):
+                return plan
+
+            if plan['valid']:
+                print(
+                    f"[{datetime.now()}] Rotation plan compiled: {len(plan['active_rotation'])} active, "
+                    f"{len(plan['reserve_pool'])} reserve SSIDs"
+                )
+            else:
+                # Not "ERROR:" - that marker means a failed rotation to the web dashboard
+                print(
+                    f"[{datetime.now()}] Warning: {self.ssid_list_file} has {len(plan['errors'])} problem(s); "
+                    f"the next rotation will fail until they are fixed:"
+                )
+                for error in plan['errors']:
+                    print(f"[{datetime.now()}]   - {error}")
+            return plan
+
+    def start(self, poll_interval=2.0):
+        """Compile now, then recompile in the background whenever the file changes"""
+        directory = os.path.dirname(os.path.abspath(self.ssid_list_file))
+        if not os.path.isdir(directory):
+            return None
+        self.compile_and_publish()
+        self.watcher = FileWatcher(self.ssid_list_file, self.compile_and_publish, poll_interval=poll_interval)
+        self.watcher.start()
+        return self.watcher
+
+    def stop(self):
+        if self.watcher:
+            self.watcher.stop()
+
+
+def main():
+    from rotate_ssid import CONFIG
+
+    parser = argparse.ArgumentParser(description="Validate ssid_list.json and publish the rotation plan")
+    parser.add_argument('--watch', action='store_true', help="Keep running and recompile on every change")
+    args = parser.parse_args()
+
+    compiler = PlanCompiler(CONFIG['ssid_list_file'], CONFIG['rotation_plan_file'], CONFIG.get('validation_cache_file'))
+    plan = compiler.compile_and_publish()
+    if not args.watch:
+        if plan['valid']:
+            print(f"[{datetime.now()}] {CONFIG['ssid_list_file']} is valid")
+        else:
+            for error in plan['errors']:
+                print(f"[{datetime.now()}]   - {error}")
+        raise SystemExit(0 if plan['valid'] else 1)
+
+    compiler.start()
+    print(f"[{datetime.now()}] Watching {CONFIG['ssid_list_file']} for changes")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        compiler.stop()
+
+
+if __name__ == "__main__":
+    main()
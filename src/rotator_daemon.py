@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+SSID Rotator Daemon
+
+Long-running alternative to the oneshot ssid-rotator.service/.timer pair.
+The daemon stays resident, schedules rotations itself and keeps its UniFi
+session and validated SSID lists warm between rotations, so neither scheduled
+nor manual rotations pay interpreter start-up, imports or a fresh login.
+
+Scheduling:
+- The next fire time is persisted in state.json as 'next_rotation_at', so a
+  restart keeps the schedule.
+- Each rotation is followed by the fixed 18 hour interval plus an optional
+  random jitter (jitter only ever delays, never shortens, the interval).
+- If the daemon was down when a rotation was due, it rotates once on start-up
+  (catch-up), like Persistent=true on the systemd timer.
+
+Manual rotations ("rotate now") are accepted over a local Unix socket; see
+send_command(). Use either this daemon or ssid-rotator.timer, not both.
+"""
+import argparse
+import fcntl
+import json
+import os
+import random
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from datetime import datetime, timedelta
+
+from rotate_ssid import CONFIG, ROTATION_INTERVAL_HOURS, SSIDRotator, write_json_atomic
+from rotation_plan import PlanCompiler
+
+DAEMON_CONFIG = {
+    "socket_path": "/run/ssid-rotator/rotator.sock",
+    "lock_file": "/run/ssid-rotator/daemon.lock",
+    "jitter_seconds": 600,  # Random delay (0..N seconds) added after the 18 hour interval
+    "first_run_delay_seconds": 300  # Delay before the first rotation when there is no history (like OnBootSec=5min)
+}
+
+
+class RotatorDaemon:
+    def __init__(self, config, daemon_config):
+        self.config = config
+        self.daemon_config = daemon_config
+        self.rotator = None
+        self.api = None
+        self.rotation_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopping = False
+        self.server = None
+
+    # ---------- scheduling ----------
+
+    def load_schedule(self):
+        """Return the persisted next fire time, deriving one if state.json has none"""
+        state = self.read_state()
+        if state.get('next_rotation_at'):
+            return datetime.fromisoformat(state['next_rotation_at'])
+        if state.get('last_rotation'):
+            return datetime.fromisoformat(state['last_rotation']) + timedelta(hours=ROTATION_INTERVAL_HOURS)
+        return datetime.now() + timedelta(seconds=self.daemon_config['first_run_delay_seconds'])
+
+    def schedule_next(self):
+        """Persist the next fire time: the fixed interval from now, plus jitter"""
+        jitter = random.uniform(0, self.daemon_config.get('jitter_seconds', 0))
+        next_fire = datetime.now() + timedelta(hours=ROTATION_INTERVAL_HOURS, seconds=jitter)
+        # A manual rotation may be saving state.json right now; don't interleave with it
+        with self.rotation_lock:
+            state = self.read_state()
+            state['next_rotation_at'] = next_fire.isoformat()
+            self.write_state(state)
+        print(f"[{datetime.now()}] Next scheduled rotation: {next_fire.strftime('%Y-%m-%d %H:%M:%S')}")
+        return next_fire
+
+    def read_state(self):
+        if os.path.exists(self.config['state_file']):
+            with open(self.config['state_file'], 'r') as f:
+                return json.load(f)
+        return {}
+
+    def write_state(self, state):
+        # The timer thread and a socket-triggered rotation may both write
+        write_json_atomic(self.config['state_file'], state)
+
+    # ---------- rotation ----------
+
+    def rotate(self, trigger):
+        """
+        Run one rotation on the warm session.
+
+        Returns:
+            tuple: (success, message)
+        """
+        if not self.rotation_lock.acquire(blocking=False):
+            return False, "A rotation is already in progress"
+        try:
+            # Same marker the oneshot script prints; the web dashboard keys its status off it
+            print(f"[{datetime.now()}] Starting SSID rotator ({trigger})...")
+            try:
+                if self.rotator is None:
+                    self.rotator = SSIDRotator(self.config)
+                if self.api is None:
+                    self.api = self.rotator.connect()
+                self.rotator.rotate(self.api)
+                return True, "SSID rotation completed successfully"
+            except Exception as e:
+                print(f"[{datetime.now()}] ERROR: {e}")
+                return False, str(e)
+        finally:
+            self.rotation_lock.release()
+
+    def run(self):
+        """Scheduler loop; returns when stop() is called"""
+        next_fire = self.load_schedule()
+        if next_fire <= datetime.now():
+            print(f"[{datetime.now()}] Rotation was due at {next_fire.strftime('%Y-%m-%d %H:%M:%S')}, catching up now")
+        else:
+            print(f"[{datetime.now()}] Next scheduled rotation: {next_fire.strftime('%Y-%m-%d %H:%M:%S')}")
+
+        while not self.stopping:
+            remaining = (next_fire - datetime.now()).total_seconds()
+            if remaining > 0:
+                # Wake at least once a minute so wall-clock changes (NTP sync on boot) are noticed
+                self.wake.wait(min(remaining, 60))
+                self.wake.clear()
+                continue
+
+            self.rotate("scheduled")
+            next_fire = self.schedule_next()
+
+    def stop(self, *args):
+        self.stopping = True
+        self.wake.set()
+        if self.server is not None:
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    # ---------- control socket ----------
+
+    def start_control_socket(self):
+        path = self.daemon_config['socket_path']
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            os.remove(path)  # Stale socket from a previous run; the lock file guarantees we are alone
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    request = json.loads(self.rfile.readline() or b'{}')
+                except ValueError:
+                    request = {}
+                command = request.get('command')
+
+                if command == 'rotate':
+                    success, message = daemon.rotate("manual")
+                    response = {"status": "success" if success else "error", "message": message}
+                elif command == 'status':
+                    response = {
+                        "status": "success",
+                        "rotating": daemon.rotation_lock.locked(),
+                        "next_rotation_at": daemon.read_state().get('next_rotation_at')
+                    }
+                else:
+                    response = {"status": "error", "message": f"Unknown command: {command}"}
+                self.wfile.write((json.dumps(response) + "\n").encode('utf-8'))
+
+        self.server = socketserver.ThreadingUnixStreamServer(path, Handler)
+        self.server.daemon_threads = True
+        # The web manager (same user) needs to connect; nobody else should
+        os.chmod(path, 0o660)
+        threading.Thread(target=self.server.serve_forever, name="control-socket", daemon=True).start()
+        print(f"[{datetime.now()}] Listening for rotate-now requests on {path}")
+
+
+class DaemonResponseError(Exception):
+    """The daemon accepted a command but closed the connection without a complete reply"""
+
+
+def send_command(command, socket_path=DAEMON_CONFIG['socket_path'], timeout=60):
+    """
+    Send a command ('rotate' or 'status') to a running daemon.
+
+    Returns:
+        dict: the daemon's JSON response
+
+    Raises:
+        FileNotFoundError, ConnectionRefusedError: if no daemon is listening on socket_path
+        socket.timeout: if the daemon didn't answer within timeout (it may still be working)
+        DaemonResponseError: if the reply was empty, cut short or not JSON
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall((json.dumps({"command": command}) + "\n").encode('utf-8'))
+        response = b''
+        while not response.endswith(b'\n'):
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            response += chunk
+
+    if not response.endswith(b'\n'):
+        if response:
+            raise DaemonResponseError(f"Daemon reply to '{command}' was cut short after {len(response)} bytes")
+        raise DaemonResponseError(f"Daemon closed the connection without replying to '{command}'")
+    try:
+        return json.loads(response)
+    except ValueError as e:
+        raise DaemonResponseError(f"Daemon reply to '{command}' is not valid JSON: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident SSID rotator with built-in scheduler")
+    parser.add_argument('--rotate-now', action='store_true', help="Ask the running daemon to rotate immediately")
+    parser.add_argument('--status', action='store_true', help="Show the running daemon's schedule")
+    args = parser.parse_args()
+
+    if args.rotate_now or args.status:
+        response = send_command('rotate' if args.rotate_now else 'status')
+        print(json.dumps(response, indent=2))
+        sys.exit(0 if response.get('status') == 'success' else 1)
+
+    # Output goes to the rotation log via systemd; flush every line so the dashboard sees it immediately
+    sys.stdout.reconfigure(line_buffering=True)
+
+    os.makedirs(os.path.dirname(DAEMON_CONFIG['lock_file']), exist_ok=True)
+    lock = open(DAEMON_CONFIG['lock_file'], 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        print(f"[{datetime.now()}] ERROR: Another rotator daemon is already running")
+        sys.exit(1)
+
+    print(f"[{datetime.now()}] SSID rotator daemon starting (pid {os.getpid()})")
+    daemon = RotatorDaemon(CONFIG, DAEMON_CONFIG)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+    daemon.start_control_socket()
+    # Validate ssid_list.json on every edit so rotations start from a ready plan
+    compiler = PlanCompiler(CONFIG['ssid_list_file'], CONFIG['rotation_plan_file'], CONFIG.get('validation_cache_file'))
+    compiler.start()
+    daemon.run()
+    compiler.stop()
+    print(f"[{datetime.now()}] SSID rotator daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+SSID Store
+
+The three lists from ssid_list.json (active rotation, reserve pool, protected
+SSIDs) kept in order, plus an index from SSID name to where it appears, so
+membership tests, lookups and removals don't scan or concatenate the lists.
+
+Removed entries leave a tombstone (None) in their list, so the positions of
+the other entries stay valid; lists are compacted once tombstones outnumber
+live entries. Names that appear more than once (in one list or across
+lists) are recorded as conflicts while loading.
+
+Used by both rotate_ssid.py and web_manager.py.
+"""
+
+ACTIVE = 'active_rotation'
+RESERVE = 'reserve_pool'
+PROTECTED = 'protected_ssids'
+LIST_KEYS = (ACTIVE, RESERVE, PROTECTED)
+
+# list_type values used by the web API -> keys in ssid_list.json
+LIST_TYPES = {
+    'active': ACTIVE,
+    'reserve': RESERVE,
+    'protected': PROTECTED
+}
+
+LIST_LABELS = {
+    ACTIVE: 'active rotation',
+    RESERVE: 'reserve pool',
+    PROTECTED: 'protected list'
+}
+
+# Tombstones are only compacted away in lists at least this long
+COMPACT_MIN_SIZE = 32
+
+
+class SSIDStore:
+    """Ordered SSID lists with a name -> [(list_key, position)] index"""
+
+    def __init__(self, data=None):
+        self.lists = {key: [] for key in LIST_KEYS}
+        self.tombstones = {key: 0 for key in LIST_KEYS}
+        self.index = {}
+        self.conflicts = []
+        if data:
+            self.load(data)
+
+    def load(self, data):
+        """Load the lists from a parsed ssid_list.json, recording duplicate names"""
+        for key in LIST_KEYS:
+            for name in data.get(key, []) or []:
+                existing = self.index.get(name)
+                if existing:
+                    self.conflicts.append((name, existing[0][0], key))
+                self._append(key, name)
+
+    # ---------- queries ----------
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def locate(self, name):
+        """Return (list_key, position) of name's first occurrence, or None"""
+        entries = self.index.get(name)
+        return entries[0] if entries else None
+
+    def list_of(self, name):
+        """Return the key of the list holding name, or None"""
+        entries = self.index.get(name)
+        return entries[0][0] if entries else None
+
+    def in_list(self, name, key):
+        return any(k == key for k, _ in self.index.get(name, ()))
+
+    def get_list(self, key):
+        """The list in order, without tombstones"""
+        return [name for name in self.lists[key] if name is not None]
+
+    def count(self, key):
+        return len(self.lists[key]) - self.tombstones[key]
+
+    def describe_conflicts(self):
+        """Human-readable conflict messages, e.g. for the log or the dashboard"""
+        messages = []
+        for name, first, second in self.conflicts:
+            if first == second:
+                messages.append(f"'{name}' appears more than once in the {LIST_LABELS[first]}")
+            else:
+                messages.append(f"'{name}' is in both the {LIST_LABELS[first]} and the {LIST_LABELS[second]}")
+        return messages
+
+    # ---------- mutations ----------
+
+    def add(self, key, name):
+        """
+        Append name to a list.
+
+        Raises:
+            ValueError: If name is already in any list
+        """
+        if name in self.index:
+            raise ValueError("SSID already exists in another list")
+        self._append(key, name)
+
+    def remove(self, key, name):
+        """
+        Remove name from a list in O(1), leaving a tombstone.
+
+        Raises:
+            ValueError: If name is not in that list
+        """
+        entries = self.index.get(name, [])
+        for i, (entry_key, position) in enumerate(entries):
+            if entry_key == key:
+                break
+        else:
+            raise ValueError(f"SSID not found in {LIST_LABELS[key]}")
+
+        del entries[i]
+        if not entries:
+            del self.index[name]
+        self.lists[key][position] = None
+        self.tombstones[key] += 1
+        if self.tombstones[key] > self.count(key) and len(self.lists[key]) >= COMPACT_MIN_SIZE:
+            self.compact(key)
+
+    def move(self, name, from_key, to_key):
+        """Move name to the end of another list"""
+        self.remove(from_key, name)
+        self._append(to_key, name)
+
+    def reorder(self, key, name, position):
+        """Move name to position (0-based, among live entries) within its list"""
+        items = self.get_list(key)
+        if name not in items:
+            raise ValueError(f"SSID not found in {LIST_LABELS[key]}")
+        if type(position) is not int or not 0 <= position < len(items):
+            raise ValueError(f"Position out of range for '{name}'")
+        items.insert(position, items.pop(items.index(name)))
+        self.replace_list(key, items)
+
+    def replace_list(self, key, names):
+        """Replace a list with a new order of the same names"""
+        if sorted(names) != sorted(self.get_list(key)):
+            raise ValueError(f"New order must contain exactly the SSIDs in the {LIST_LABELS[key]}")
+        self.lists[key] = list(names)
+        self.tombstones[key] = 0
+        self._reindex(key)
+
+    def compact(self, key):
+        """Drop tombstones from a list and renumber its index entries"""
+        self.lists[key] = self.get_list(key)
+        self.tombstones[key] = 0
+        self._reindex(key)
+
+    def write_to(self, data):
+        """Store the lists back into a ssid_list.json dict"""
+        for key in LIST_KEYS:
+            data[key] = self.get_list(key)
+        return data
+
+    # ---------- internals ----------
+
+    def _append(self, key, name):
+        self.index.setdefault(name, []).append((key, len(self.lists[key])))
+        self.lists[key].append(name)
+
+    def _reindex(self, key):
+        for name in set(self.lists[key]):
+            if name is None:
+                continue
+            others = [entry for entry in self.index.get(name, []) if entry[0] != key]
+            self.index[name] = others
+        for position, name in enumerate(self.lists[key]):
+            if name is not None:
+                self.index[name].append((key, position))
+        for name in [n for n, entries in self.index.items() if not entries]:
+            del self.index[name]
@@ -5,6 +5,45 @@ SSID Validation Module
 Validates WiFi SSID names according to 802.11 standard and practical limitations.
 Ensures SSIDs will be accepted by UniFi API and compatible with most client devices.
 """
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+# Bump whenever validate_ssid() changes what it accepts or the messages it returns;
+# persisted ValidationCache files from an older version are then discarded.
+VALIDATION_RULES_VERSION = 1
+
+# Fully validated ssid_list.json contents remembered by ValidationCache
+VALIDATED_FILE_HISTORY = 16
+
+# Per-SSID results kept on disk before unused entries are dropped
+VALIDATION_CACHE_MAX_ENTRIES = 50000
+
+# Result codes returned by validate_ssid_codes(), one per SSID
+SSID_OK = 0
+SSID_NOT_STRING = 1
+SSID_EMPTY = 2
+SSID_SURROUNDING_SPACES = 3
+SSID_INVALID_UNICODE = 4
+SSID_TOO_LONG = 5
+SSID_INVALID_CHARS = 6
+
+# SSIDs per work unit in validate_ssid_corpus(); smaller corpora are validated in-process
+CORPUS_CHUNK_SIZE = 50000
+
+# Control characters (ASCII 0-31) and DEL, as rejected by validate_ssid()
+INVALID_CHARS_RE = re.compile('[\x00-\x1f\x7f]')
+
+# Control characters that read as a word break; suggestions replace them with a space
+WHITESPACE_CONTROL_RE = re.compile('[\t\n\r]+')
 
 
 class SSIDValidationError(Exception):
@@ -108,7 +147,12 @@ def validate_ssid(ssid, strict=True):
     return True, None
 
 
-def validate_ssid_list(ssid_list, list_name="SSID list", strict=True):
+def format_ssid_error(list_name, index, ssid, error_msg):
+    """Error message for one SSID, as used by every list validator in this module"""
+    return f"{list_name}[{index}] '{ssid}': {error_msg}"
+
+
+def validate_ssid_list(ssid_list, list_name="SSID list", strict=True, cache=None):
     """
     Validate a list of SSIDs.
 
@@ -116,6 +160,7 @@ def validate_ssid_list(ssid_list, list_name="SSID list", strict=True):
         ssid_list (list): List of SSID names to validate
         list_name (str): Name of the list for error messages
         strict (bool): If True, enforce best practices
+        cache (ValidationCache): Optional cache of per-SSID results
 
     Returns:
         tuple: (all_valid, errors)
@@ -125,12 +170,18 @@ def validate_ssid_list(ssid_list, list_name="SSID list", strict=True):
     Raises:
         SSIDValidationError: If any SSID is invalid (with details)
     """
+    if cache is None:
+        _, errors = validate_ssid_batch(ssid_list, list_name, strict=strict)
+        return not errors, errors
+
     errors = []
 
+    check = cache.validate
+
     for i, ssid in enumerate(ssid_list):
-        is_valid, error_msg = validate_ssid(ssid, strict=strict)
+        is_valid, error_msg = check(ssid, strict=strict)
         if not is_valid:
-            errors.append(f"{list_name}[{i}] '{ssid}': {error_msg}")
+            errors.append(format_ssid_error(list_name, i, ssid, error_msg))
 
     if errors:
         return False, errors
@@ -138,6 +189,249 @@ def validate_ssid_list(ssid_list, list_name="SSID list", strict=True):
     return True, []
 
 
+def validate_ssid_codes(ssids, strict=True):
+    """
+    Validate a whole sequence of SSIDs in one pass.
+
+    Applies the same rules as validate_ssid() but only computes a result
+    code per SSID; no messages are built. Pure-ASCII SSIDs (the common case)
+    are checked with C-level string methods without encoding them.
+
+    Args:
+        ssids (iterable): SSID names to validate
+        strict (bool): If True, enforce best practices
+
+    Returns:
+        bytearray: One SSID_* code per SSID, in input order
+    """
+    codes = bytearray()
+    append = codes.append
+    find_invalid = INVALID_CHARS_RE.search
+
+    for ssid in ssids:
+        if not isinstance(ssid, str):
+            append(SSID_NOT_STRING)
+        elif not ssid:
+            append(SSID_EMPTY)
+        elif strict and (ssid[0].isspace() or ssid[-1].isspace()):
+            append(SSID_SURROUNDING_SPACES)
+        elif ssid.isascii():
+            # One byte per character; among ASCII, only 0-31 and DEL are unprintable
+            if len(ssid) > 32:
+                append(SSID_TOO_LONG)
+            elif not ssid.isprintable():
+                append(SSID_INVALID_CHARS)
+            else:
+                append(SSID_OK)
+        else:
+            try:
+                byte_length = len(ssid.encode('utf-8'))
+            except UnicodeEncodeError:
+                append(SSID_INVALID_UNICODE)
+                continue
+            if byte_length > 32:
+                append(SSID_TOO_LONG)
+            elif find_invalid(ssid):
+                append(SSID_INVALID_CHARS)
+            else:
+                append(SSID_OK)
+
+    return codes
+
+
+def validate_ssid_batch(ssids, list_name="SSID list", strict=True, start=0):
+    """
+    Validate a large sequence of SSIDs, e.g. a wordlist being imported.
+
+    Args:
+        ssids (list): SSID names to validate
+        list_name (str): Name of the list for error messages
+        strict (bool): If True, enforce best practices
+        start (int): Index of ssids[0] in the full list, for error messages
+
+    Returns:
+        tuple: (codes, errors)
+            codes (bytearray): One SSID_* code per SSID
+            errors (list): Messages in validate_ssid_list() format, built for failures only
+    """
+    codes = validate_ssid_codes(ssids, strict=strict)
+    errors = []
+    if codes.count(SSID_OK) != len(codes):
+        for i, code in enumerate(codes):
+            if code != SSID_OK:
+                _, error_msg = validate_ssid(ssids[i], strict=strict)
+                errors.append(format_ssid_error(list_name, start + i, ssids[i], error_msg))
+    return codes, errors
+
+
+def _validate_chunk(args):
+    """Process pool worker for iter_validate_corpus()"""
+    start, ssids, list_name, strict = args
+    codes, errors = validate_ssid_batch(ssids, list_name, strict=strict, start=start)
+    return start, codes, errors
+
+
+def iter_validate_corpus(ssids, list_name="SSID list", strict=True, workers=None, chunk_size=CORPUS_CHUNK_SIZE):
+    """
+    Validate a very large corpus across a process pool, streaming results.
+
+    The input is consumed lazily in chunks (so a generator over a
+    multi-million line file never has to be held in memory), at most two
+    chunks per worker are in flight, and results come back in input order.
+
+    Args:
+        ssids (iterable): SSID names to validate
+        list_name (str): Name of the list for error messages
+        strict (bool): If True, enforce best practices
+        workers (int): Worker processes (default: one per CPU core)
+        chunk_size (int): SSIDs per work unit
+
+    Yields:
+        tuple: (start, codes, errors) per chunk, in input order, where
+            start (int): index of the chunk's first SSID in the corpus
+            codes (bytearray): SSID_* code per SSID in the chunk
+            errors (list): messages with corpus-wide indices, as validate_ssid_list()
+    """
+    workers = workers or os.cpu_count() or 1
+    source = iter(ssids)
+
+    def chunks():
+        start = 0
+        while True:
+            chunk = list(islice(source, chunk_size))
+            if not chunk:
+                return
+            yield start, chunk, list_name, strict
+            start += len(chunk)
+
+    pending_chunks = chunks()
+    first = next(pending_chunks, None)
+    if first is None:
+        return
+    second = next(pending_chunks, None)
+    if second is None or workers == 1:
+        # Not worth starting processes for a single chunk
+        yield _validate_chunk(first)
+        if second is not None:
+            yield _validate_chunk(second)
+            for chunk in pending_chunks:
+                yield _validate_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque([pool.submit(_validate_chunk, first), pool.submit(_validate_chunk, second)])
+        for chunk in pending_chunks:
+            in_flight.append(pool.submit(_validate_chunk, chunk))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def validate_ssid_corpus(ssids, list_name="SSID list", strict=True, workers=None, chunk_size=CORPUS_CHUNK_SIZE):
+    """
+    Parallel equivalent of validate_ssid_list() for very large corpora.
+
+    Returns:
+        tuple: (all_valid, errors), identical to validate_ssid_list() on the same input
+    """
+    errors = []
+    for _, _, chunk_errors in iter_validate_corpus(ssids, list_name, strict, workers, chunk_size):
+        errors.extend(chunk_errors)
+    return not errors, errors
+
+
+class ValidationCache:
+    """
+    Remembers validate_ssid() results so unchanged SSID lists are not revalidated.
+
+    Two levels:
+    - File level: the SHA-256 of every ssid_list.json content that passed
+      validation. Loading the same content again needs no SSID checks at all.
+    - SSID level: the result for each (strict, ssid) pair. After an edit only
+      the SSIDs that were added or changed are actually validated.
+
+    Results are tied to VALIDATION_RULES_VERSION, so changing the rules
+    invalidates everything cached under the old ones.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.valid_files = []
+        self.results = {}
+        self.used = set()
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    @staticmethod
+    def content_hash(raw_bytes):
+        return hashlib.sha256(raw_bytes).hexdigest()
+
+    @staticmethod
+    def key(ssid, strict):
+        return f"{1 if strict else 0}|{ssid}"
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return  # Unreadable cache: start empty, it is rebuilt on the next save
+        if data.get('rules_version') != VALIDATION_RULES_VERSION:
+            self.dirty = True
+            return
+        self.valid_files = data.get('valid_files', [])
+        self.results = data.get('results', {})
+
+    def save(self):
+        """Write the cache back if anything changed (atomic replace)"""
+        if not self.path or not self.dirty:
+            return
+        if len(self.results) > VALIDATION_CACHE_MAX_ENTRIES:
+            self.results = {k: v for k, v in self.results.items() if k in self.used}
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    "rules_version": VALIDATION_RULES_VERSION,
+                    "valid_files": self.valid_files,
+                    "results": self.results
+                }, f)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError:
+            pass  # The cache is only an optimisation
+
+    def is_file_valid(self, digest):
+        return digest in self.valid_files
+
+    def mark_file_valid(self, digest):
+        if digest in self.valid_files:
+            return
+        self.valid_files = (self.valid_files + [digest])[-VALIDATED_FILE_HISTORY:]
+        self.dirty = True
+
+    def validate(self, ssid, strict=True):
+        """Cached equivalent of validate_ssid()"""
+        if not isinstance(ssid, str):
+            return validate_ssid(ssid, strict=strict)
+        key = self.key(ssid, strict)
+        self.used.add(key)
+        if key in self.results:
+            self.hits += 1
+            error_msg = self.results[key]
+            return error_msg is None, error_msg
+        self.misses += 1
+        is_valid, error_msg = validate_ssid(ssid, strict=strict)
+        self.results[key] = error_msg
+        self.dirty = True
+        return is_valid, error_msg
+
+
 def get_ssid_byte_length(ssid):
     """
     Get the byte length of an SSID when encoded as UTF-8.
@@ -154,42 +448,181 @@ def get_ssid_byte_length(ssid):
         return -1
 
 
-def suggest_ssid_fix(ssid):
+def _extends_cluster(char):
+    """True if char never starts a grapheme cluster (it attaches to the one before it)"""
+    code = ord(char)
+    return (
+        code == 0x200D                      # Zero width joiner
+        or 0xFE00 <= code <= 0xFE0F         # Variation selectors (e.g. emoji presentation)
+        or 0x1F3FB <= code <= 0x1F3FF       # Emoji skin tone modifiers
+        or 0xE0020 <= code <= 0xE007F       # Tag characters (subdivision flags)
+        or unicodedata.category(char) in ('Mn', 'Mc', 'Me')  # Combining marks
+    )
+
+
+def _is_regional_indicator(char):
+    return 0x1F1E6 <= ord(char) <= 0x1F1FF
+
+
+def truncate_utf8(text, max_bytes=32, graphemes=True):
     """
-    Suggest a fix for an invalid SSID.
+    Cut text to at most max_bytes of UTF-8 in linear time.
+
+    The string is encoded once and cut at the last character boundary that
+    fits. With graphemes=True the cut also moves back to the start of a
+    grapheme cluster, so combining accents, skin tones, ZWJ sequences
+    (e.g. family emoji) and flags are never split into stray pieces.
+
+    Args:
+        text (str): Text to truncate
+        max_bytes (int): Maximum UTF-8 byte length
+        graphemes (bool): Only cut between grapheme clusters
+
+    Returns:
+        str: The longest acceptable prefix of text
+    """
+    encoded = text.encode('utf-8', 'surrogatepass')
+    if len(encoded) <= max_bytes:
+        return text
+
+    # Step back over UTF-8 continuation bytes (10xxxxxx) to a character start
+    cut = max_bytes
+    while cut > 0 and (encoded[cut] & 0xC0) == 0x80:
+        cut -= 1
+    end = len(encoded[:cut].decode('utf-8', 'surrogatepass'))
+
+    if graphemes:
+        while end > 0:
+            following = text[end]
+            if _extends_cluster(following) or text[end - 1] == '\u200d':
+                end -= 1
+                continue
+            if _is_regional_indicator(following):
+                # Flags are pairs of regional indicators; never keep half a pair
+                run = 0
+                while end - run > 0 and _is_regional_indicator(text[end - run - 1]):
+                    run += 1
+                if run % 2:
+                    end -= 1
+                    continue
+            break
+
+    return text[:end]
+
+
+def suggest_ssid_fixes(ssid, limit=3):
+    """
+    Suggest fixed versions of an invalid SSID, best first.
+
+    Candidates, in order of preference:
+    1. Spaces trimmed, tabs/newlines turned into spaces, other control
+       characters removed, cut to 32 bytes
+    2. All control characters removed instead
+    3. Cut at the last word boundary instead of mid-word
+    4. Accents folded and other non-ASCII characters (emoji etc.) dropped,
+       for maximum device compatibility
+
+    Only valid, distinct candidates are returned. Every step is linear in the
+    length of the SSID, so this is cheap enough to run on each keystroke.
 
     Args:
         ssid (str): The invalid SSID
+        limit (int): Maximum number of suggestions
 
     Returns:
-        str or None: Suggested fixed SSID, or None if can't fix
+        list: Suggested SSIDs (may be empty)
     """
     if not isinstance(ssid, str):
-        return None
+        return []
 
-    # Remove leading/trailing whitespace
-    fixed = ssid.strip()
+    spaced = INVALID_CHARS_RE.sub('', WHITESPACE_CONTROL_RE.sub(' ', ssid)).strip()
+    removed = INVALID_CHARS_RE.sub('', ssid).strip()
 
-    # Remove control characters
-    fixed = ''.join(char for char in fixed if ord(char) >= 32 and ord(char) != 127)
+    candidates = [
+        truncate_utf8(spaced).rstrip(),
+        truncate_utf8(removed).rstrip()
+    ]
 
-    # If still too long, truncate to 32 bytes
-    byte_length = get_ssid_byte_length(fixed)
-    if byte_length > 32:
-        # Truncate carefully to avoid cutting UTF-8 sequences
-        while get_ssid_byte_length(fixed) > 32:
-            fixed = fixed[:-1]
+    cut = truncate_utf8(spaced)
+    if cut != spaced and ' ' in cut:
+        # Drop the partial last word unless the cut happened to land between words
+        if not spaced[len(cut)].isspace():
+            cut = cut.rsplit(' ', 1)[0]
+        candidates.append(cut.rstrip())
+
+    folded = unicodedata.normalize('NFKD', spaced).encode('ascii', 'ignore').decode('ascii')
+    candidates.append(truncate_utf8(' '.join(folded.split())))
 
-    # Validate the fix
-    is_valid, _ = validate_ssid(fixed, strict=True)
-    if is_valid and fixed:
-        return fixed
+    suggestions = []
+    for candidate in candidates:
+        if candidate and candidate != ssid and candidate not in suggestions and validate_ssid(candidate, strict=True)[0]:
+            suggestions.append(candidate)
+            if len(suggestions) >= limit:
+                break
+    return suggestions
 
-    return None
+
+def suggest_ssid_fix(ssid):
+    """
+    Suggest a fix for an invalid SSID.
+
+    Args:
+        ssid (str): The invalid SSID
+
+    Returns:
+        str or None: Suggested fixed SSID, or None if can't fix
+    """
+    suggestions = suggest_ssid_fixes(ssid, limit=1)
+    return suggestions[0] if suggestions else None
+
+
+def benchmark(count=200000):
+    """Compare validate_ssid() per item against validate_ssid_codes() on a synthetic wordlist"""
+    samples = ["Pretty Fly for a WiFi", "Guest Network 5G", "🚀 Rocket WiFi", "A" * 40, " Leading", "Tab\there"]
+    ssids = [f"{samples[i % len(samples)]} {i}" for i in range(count)]
+
+    start = time.perf_counter()
+    slow_results = [validate_ssid(ssid, strict=True)[0] for ssid in ssids]
+    per_item = time.perf_counter() - start
+
+    start = time.perf_counter()
+    codes = validate_ssid_codes(ssids, strict=True)
+    batch = time.perf_counter() - start
+
+    assert [code == SSID_OK for code in codes] == slow_results, "batch and per-item results differ"
+    print(f"validate_ssid():        {count / per_item:12,.0f} SSIDs/s ({per_item:.3f}s)")
+    print(f"validate_ssid_codes():  {count / batch:12,.0f} SSIDs/s ({batch:.3f}s, {per_item / batch:.1f}x)")
+
+
+def validate_corpus_file(path, list_name=None, strict=True, workers=None):
+    """Validate a one-SSID-per-line file across all cores, printing errors as they are found"""
+    list_name = list_name or os.path.basename(path)
+    total = invalid = 0
+    start = time.perf_counter()
+    with open(path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+        lines = (line.rstrip('\r\n') for line in f)
+        for _, codes, errors in iter_validate_corpus(lines, list_name, strict, workers):
+            total += len(codes)
+            invalid += len(errors)
+            for error in errors:
+                # Undecodable bytes arrive as lone surrogates; show them escaped
+                print(error.encode('utf-8', 'backslashreplace').decode('utf-8'))
+    elapsed = time.perf_counter() - start
+    print(f"{total:,} SSIDs checked, {invalid:,} invalid ({total / max(elapsed, 1e-9):,.0f} SSIDs/s)", file=sys.stderr)
+    return invalid == 0
 
 
 # Example usage and testing
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench":
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 200000)
+        sys.exit(0)
+
+    if len(sys.argv) > 2 and sys.argv[1] == "--corpus":
+        # python3 ssid_validator.py --corpus candidates.txt [workers]
+        workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+        sys.exit(0 if validate_corpus_file(sys.argv[2], workers=workers) else 1)
+
     # Test cases
     test_ssids = [
         ("Valid SSID", True),
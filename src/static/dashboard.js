@@ -0,0 +1,498 @@
+// Live state: poll /api/state (a conditional GET, usually answered 304) and
+// swap in only the sections whose rendered HTML changed
+const etagMeta = document.querySelector('meta[name="state-etag"]');
+let stateETag = etagMeta ? etagMeta.content : null;
+const sectionHtml = {};
+let rotating = false;
+
+function refreshState() {
+    const headers = stateETag ? { 'If-None-Match': '"' + stateETag + '"' } : {};
+    return fetch('/api/state', { headers: headers, cache: 'no-store' })
+    .then(response => {
+        if (response.status === 304 || !response.ok) return;
+        const etag = (response.headers.get('ETag') || '').replace(/"/g, '');
+        return response.json().then(data => {
+            // Keep the old ETag if a section was held back, so the next
+            // refresh gets a full answer instead of a 304
+            if (applyState(data)) stateETag = etag;
+        });
+    })
+    .catch(() => {});  // Offline for a moment; the next tick tries again
+}
+
+// Returns false if a section was left out and still needs applying
+function applyState(data) {
+    let complete = true;
+    Object.keys(data.sections).forEach(name => {
+        const html = data.sections[name];
+        if (sectionHtml[name] === html) return;
+        // Don't replace the rotate button and its progress message mid-rotation
+        if (name === 'status' && rotating) {
+            complete = false;
+            return;
+        }
+        const element = document.querySelector(`[data-section="${name}"]`);
+        if (element) element.innerHTML = html;
+        sectionHtml[name] = html;
+    });
+    return complete;
+}
+
+// Batch mode: edits are queued locally and sent to /api/batch together
+let batchMode = false;
+const pendingOps = [];
+
+function toggleBatchMode(enabled) {
+    if (!enabled && pendingOps.length && !confirm(`Discard ${pendingOps.length} queued change(s)?`)) {
+        document.getElementById('batchToggle').checked = true;
+        return;
+    }
+    batchMode = enabled;
+    document.body.classList.toggle('batch-mode', enabled);
+    if (!enabled) discardBatch();
+}
+
+function queueOp(operation, description) {
+    pendingOps.push({ operation: operation, description: description });
+    renderBatch();
+}
+
+function renderBatch() {
+    const list = document.getElementById('batchList');
+    list.innerHTML = '';
+    pendingOps.forEach(item => {
+        const li = document.createElement('li');
+        li.textContent = item.description;
+        list.appendChild(li);
+    });
+    document.getElementById('batchSummary').textContent = pendingOps.length ?
+        `${pendingOps.length} queued change(s)` : 'Queue several changes and apply them in one save';
+    document.getElementById('batchApply').disabled = !pendingOps.length;
+    document.getElementById('batchDiscard').disabled = !pendingOps.length;
+}
+
+function discardBatch() {
+    pendingOps.length = 0;
+    renderBatch();
+}
+
+function applyBatch() {
+    if (!pendingOps.length) return;
+    fetch('/api/batch', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ operations: pendingOps.map(item => item.operation) })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            discardBatch();
+            refreshState();
+        } else {
+            // Nothing was saved; leave the queue so it can be fixed and retried
+            alert('Error: ' + data.error + '\n\nNo changes were saved.');
+        }
+    });
+}
+
+function reorderSSID(ssid, offset) {
+    const operation = { op: 'reorder', list_type: 'active', ssid: ssid, offset: offset };
+    if (batchMode) {
+        queueOp(operation, `Move "${ssid}" ${offset < 0 ? 'up' : 'down'}`);
+        return;
+    }
+    fetch('/api/batch', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ operations: [operation] })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            refreshState();
+        } else {
+            alert('Error: ' + data.error);
+        }
+    });
+}
+
+function addSSID(event, listType) {
+    event.preventDefault();
+    const inputId = listType === 'active' ? 'new-active-ssid' : 
+                   listType === 'reserve' ? 'new-reserve-ssid' : 
+                   'new-protected-ssid';
+    const input = document.getElementById(inputId);
+    const ssid = input.value.trim();
+
+    if (!ssid) return;
+
+    if (batchMode) {
+        queueOp({ op: 'add', ssid: ssid, list_type: listType }, `Add "${ssid}" to ${listType}`);
+        input.value = '';
+        document.getElementById('hint-' + listType).textContent = '';
+        return;
+    }
+
+    fetch('/api/add', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ ssid: ssid, list_type: listType })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            input.value = '';
+            document.getElementById('hint-' + listType).textContent = '';
+            refreshState();
+        } else {
+            alert('Error: ' + data.error);
+        }
+    });
+}
+
+// Live validation while typing (debounced; stale replies are ignored)
+const checkTimers = {};
+const checkSeq = {};
+
+function checkSSID(listType) {
+    clearTimeout(checkTimers[listType]);
+    checkTimers[listType] = setTimeout(() => {
+        const input = document.getElementById('new-' + listType + '-ssid');
+        const hint = document.getElementById('hint-' + listType);
+        const seq = (checkSeq[listType] || 0) + 1;
+        checkSeq[listType] = seq;
+
+        if (!input.value.trim()) {
+            hint.className = 'ssid-hint';
+            hint.textContent = '';
+            return;
+        }
+
+        fetch('/api/validate', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ ssid: input.value })
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (seq !== checkSeq[listType]) return;
+            hint.textContent = '';
+            if (data.valid) {
+                hint.className = 'ssid-hint ok';
+                hint.textContent = '✓ ' + data.byte_length + '/32 bytes';
+                return;
+            }
+            hint.className = 'ssid-hint error';
+            hint.appendChild(document.createTextNode('✗ ' + data.error + ' '));
+            data.suggestions.forEach(suggestion => {
+                const chip = document.createElement('span');
+                chip.className = 'suggestion';
+                chip.title = 'Use this name';
+                chip.textContent = suggestion;
+                chip.onclick = () => {
+                    input.value = suggestion;
+                    checkSSID(listType);
+                };
+                hint.appendChild(chip);
+            });
+        });
+    }, 150);
+}
+
+// Bulk import: upload the file as-is and read the per-line report as it streams back
+async function importSSIDs(event) {
+    event.preventDefault();
+    const file = document.getElementById('import-file').files[0];
+    const status = document.getElementById('import-status');
+    const btn = document.getElementById('importBtn');
+    if (!file) return;
+
+    const name = file.name.toLowerCase();
+    const format = name.endsWith('.csv') ? 'csv' :
+                   (name.endsWith('.ndjson') || name.endsWith('.jsonl')) ? 'ndjson' : 'text';
+
+    btn.disabled = true;
+    status.className = 'ssid-hint';
+    status.textContent = 'Importing...';
+
+    const counts = { added: 0, duplicate: 0, invalid: 0 };
+    const problems = [];
+    let summary = null;
+
+    try {
+        const response = await fetch('/api/import?list_type=reserve&format=' + format, {
+            method: 'POST',
+            body: file
+        });
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffered = '';
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffered += decoder.decode(value, { stream: true });
+            const lines = buffered.split('\n');
+            buffered = lines.pop();
+            lines.filter(line => line).forEach(line => {
+                const result = JSON.parse(line);
+                if (result.summary) {
+                    summary = result;
+                    return;
+                }
+                counts[result.status] += 1;
+                if (result.status === 'invalid' && problems.length < 5) {
+                    problems.push('line ' + result.line + ': ' + result.error);
+                }
+            });
+            status.textContent = `Importing... ${counts.added} added, ${counts.duplicate} duplicates, ${counts.invalid} invalid`;
+        }
+    } catch (error) {
+        status.className = 'ssid-hint error';
+        status.textContent = '❌ Import failed: ' + error;
+        btn.disabled = false;
+        return;
+    }
+
+    status.className = 'ssid-hint ' + (counts.invalid ? 'error' : 'ok');
+    status.textContent = `${counts.added} added, ${counts.duplicate} duplicates skipped, ${counts.invalid} invalid` +
+        (problems.length ? ' (' + problems.join('; ') + ')' : '');
+    btn.disabled = false;
+    if (summary && summary.committed) {
+        refreshState();
+    }
+}
+
+function deleteSSID(ssid, listType) {
+    if (batchMode) {
+        queueOp({ op: 'delete', ssid: ssid, list_type: listType }, `Delete "${ssid}" from ${listType}`);
+        return;
+    }
+    if (!confirm(`Delete "${ssid}" from ${listType}?`)) return;
+
+    fetch('/api/delete', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ ssid: ssid, list_type: listType })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            refreshState();
+        } else {
+            alert('Error: ' + data.error);
+        }
+    });
+}
+
+function moveToReserve(ssid) {
+    if (batchMode) {
+        queueOp({ op: 'move', ssid: ssid, from: 'active', to: 'reserve' }, `Move "${ssid}" to reserve`);
+        return;
+    }
+    if (!confirm(`Move "${ssid}" to reserve pool?`)) return;
+
+    fetch('/api/move', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ ssid: ssid, from: 'active', to: 'reserve' })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            refreshState();
+        } else {
+            alert('Error: ' + data.error);
+        }
+    });
+}
+
+function moveToActive(ssid) {
+    if (batchMode) {
+        queueOp({ op: 'move', ssid: ssid, from: 'reserve', to: 'active' }, `Move "${ssid}" to active`);
+        return;
+    }
+    if (!confirm(`Move "${ssid}" to active rotation?`)) return;
+
+    fetch('/api/move', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ ssid: ssid, from: 'reserve', to: 'active' })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            refreshState();
+        } else {
+            alert('Error: ' + data.error);
+        }
+    });
+}
+
+function makeNext(targetIndex, ssidName) {
+    if (!confirm(`Make "${ssidName}" the next SSID to rotate to?`)) {
+        return;
+    }
+
+    fetch(`/api/set_next/${targetIndex}`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        }
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.status === 'success') {
+            alert(data.message);
+            // Show the updated "NEXT" badge
+            refreshState();
+        } else {
+            alert('Error: ' + data.message);
+        }
+    })
+    .catch(error => {
+        alert('Network error: ' + error);
+    });
+}
+
+// End of a rotation started from this page. Live updates arrive while it
+// runs and their refreshes leave the status section alone, so redraw it
+// unconditionally rather than trusting the ETag or the cached HTML.
+function finishRotating() {
+    rotating = false;
+    delete sectionHtml.status;
+    stateETag = null;
+    return refreshState();
+}
+
+function rotateNow() {
+    const btn = document.getElementById('rotateBtn');
+    const statusDiv = document.getElementById('rotateStatus');
+
+    if (!confirm('Push the staged SSID live to UniFi now?')) {
+        return;
+    }
+
+    // Disable button and show loading
+    rotating = true;
+    btn.disabled = true;
+    btn.innerHTML = '⏳ Rotating...';
+    statusDiv.className = 'rotate-status show loading';
+    statusDiv.innerHTML = 'Pushing SSID to UniFi...';
+
+    fetch('/api/rotate_now', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        }
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.status === 'success') {
+            statusDiv.className = 'rotate-status show success';
+            statusDiv.innerHTML = '✅ ' + data.message;
+
+            // Show the new SSID after 2 seconds
+            setTimeout(finishRotating, 2000);
+        } else if (data.status === 'running') {
+            // Still rotating in the daemon; live updates / refreshState() pick up the result
+            statusDiv.innerHTML = '⏳ ' + data.message;
+            rotating = false;
+            btn.disabled = false;
+            btn.innerHTML = '🔄 Rotate SSID Now';
+        } else {
+            statusDiv.className = 'rotate-status show error';
+            statusDiv.innerHTML = '❌ ' + data.message;
+            if (data.error) {
+                statusDiv.innerHTML += '<br><small>' + data.error + '</small>';
+            }
+            rotating = false;
+            btn.disabled = false;
+            btn.innerHTML = '🔄 Rotate SSID Now';
+        }
+    })
+    .catch(error => {
+        statusDiv.className = 'rotate-status show error';
+        statusDiv.innerHTML = '❌ Network error: ' + error;
+        rotating = false;
+        btn.disabled = false;
+        btn.innerHTML = '🔄 Rotate SSID Now';
+    });
+}
+
+// Auto-refresh functionality
+let refreshInterval = 60; // seconds
+let refreshCountdown = refreshInterval;
+let refreshTimer = null;
+let isPaused = false;
+
+function updateRefreshIndicator() {
+    const indicator = document.getElementById('refreshCountdown');
+    if (indicator) {
+        if (isPaused) {
+            indicator.textContent = 'Paused';
+        } else if (liveUpdates) {
+            indicator.textContent = 'Live';
+        } else {
+            indicator.textContent = `Refreshing in ${refreshCountdown}s`;
+        }
+    }
+}
+
+function startRefreshTimer() {
+    refreshTimer = setInterval(() => {
+        // While the event stream is connected the server says when to refresh
+        if (!isPaused && !liveUpdates) {
+            refreshCountdown--;
+            updateRefreshIndicator();
+
+            if (refreshCountdown <= 0) {
+                refreshCountdown = refreshInterval;
+                refreshState();
+            }
+        }
+    }, 1000);
+}
+
+function toggleRefreshPause() {
+    isPaused = !isPaused;
+    const btn = document.getElementById('pauseRefreshBtn');
+    if (btn) {
+        btn.textContent = isPaused ? 'Resume' : 'Pause';
+    }
+    if (!isPaused) {
+        refreshState();  // Catch up on anything that happened while paused
+    }
+    updateRefreshIndicator();
+}
+
+// Push updates: the server sends an event when a rotation starts or ends, a
+// list is edited or the next SSID is staged. Polling takes over while the
+// stream is down; EventSource reconnects on its own, sending Last-Event-ID.
+let liveUpdates = false;
+
+function startLiveUpdates() {
+    if (!window.EventSource) return;
+    const events = new EventSource('/api/events');
+    events.onopen = () => {
+        liveUpdates = true;
+        updateRefreshIndicator();
+        refreshState();  // Covers anything missed while disconnected
+    };
+    events.onerror = () => {
+        liveUpdates = false;
+        refreshCountdown = refreshInterval;
+        updateRefreshIndicator();
+    };
+    ['rotation_started', 'rotation_completed', 'rotation_failed', 'list_edited', 'staged_next_changed']
+        .forEach(name => events.addEventListener(name, () => {
+            if (!isPaused) refreshState();
+        }));
+}
+
+// Start the refresh timer when page loads
+window.addEventListener('DOMContentLoaded', function() {
+    updateRefreshIndicator();
+    startRefreshTimer();
+    startLiveUpdates();
+});
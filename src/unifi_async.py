@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Asyncio UniFi Client
+
+An asyncio counterpart to rotate_ssid.UniFiAPI with the same operations
+(login, get_wlan_configs, get_wlan_by_id, update_ssid). Every client can share
+one bounded, keep-alive connection pool, so a single event loop can drive
+calls to hundreds of controllers without a thread per call.
+
+Requires aiohttp (pip3 install aiohttp --break-system-packages). The
+synchronous client in rotate_ssid.py does not need it.
+"""
+import asyncio
+import json as json_module
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+try:
+    import aiohttp
+    from yarl import URL
+except ImportError:  # Optional dependency: only the async paths need it
+    aiohttp = None
+
+from rotate_ssid import BackoffVerifier, CallTimings, SessionCache, WLANIndex
+
+
+def cookie_expiry(morsel):
+    """
+    Unix time a cookie from aiohttp's jar expires at, or None for a session cookie.
+
+    Max-Age wins over Expires, as in the jar itself; stored like the sync
+    client's cookie.expires so SessionCache.save() can honour it.
+    """
+    try:
+        if morsel['max-age']:
+            return time.time() + int(morsel['max-age'])
+        if morsel['expires']:
+            return parsedate_to_datetime(morsel['expires']).timestamp()
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def make_connector(limit=100, limit_per_host=4, keepalive_timeout=30):
+    """
+    Create a connection pool to share between AsyncUniFiAPI clients.
+
+    Args:
+        limit (int): Maximum open connections across all controllers
+        limit_per_host (int): Maximum open connections to one controller
+        keepalive_timeout (float): Seconds an idle connection is kept for reuse
+    """
+    if aiohttp is None:
+        raise Exception("The async UniFi client requires aiohttp (pip3 install aiohttp)")
+    # UniFi controllers use self-signed certificates (same as verify=False in the sync client)
+    return aiohttp.TCPConnector(
+        limit=limit, limit_per_host=limit_per_host, keepalive_timeout=keepalive_timeout, ssl=False
+    )
+
+
+class HTTPStatusError(Exception):
+    """A UniFi request answered with HTTP 400 or above (after any re-login)"""
+
+    def __init__(self, method, url, status):
+        super().__init__(f"{method} {url} failed with HTTP {status}")
+        self.status = status
+
+
+async def wait_for_name(verifier, fetch_name, expected):
+    """Async version of BackoffVerifier.wait() that sleeps without blocking the loop"""
+    start = time.monotonic()
+    deadline = start + verifier.timeout
+    delay = verifier.initial_delay
+    polls = 0
+    last_name = None
+
+    while True:
+        polls += 1
+        try:
+            last_name = await fetch_name()
+        # Like BackoffVerifier.wait(), a failed poll (including an HTTP error
+        # such as a transient 5xx) is retried until the deadline
+        except (aiohttp.ClientError, asyncio.TimeoutError, HTTPStatusError) as e:
+            print(f"[{datetime.now()}] Verification poll {polls} failed: {e}")
+        else:
+            if last_name == expected:
+                return {
+                    "converged": True,
+                    "seconds": round(time.monotonic() - start, 3),
+                    "polls": polls,
+                    "last_name": last_name
+                }
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return {
+                "converged": False,
+                "seconds": round(time.monotonic() - start, 3),
+                "polls": polls,
+                "last_name": last_name
+            }
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * verifier.factor, verifier.max_delay)
+
+
+class AsyncUniFiAPI:
+    """
+    Asyncio UniFi client. Use as an async context manager:
+
+        async with AsyncUniFiAPI(host, username, password, connector=pool) as api:
+            await api.update_ssid(wlan_id, "New Name")
+    """
+
+    def __init__(self, host, username, password, site="default", connector=None, timeout=10,
+                 verifier=None, session_cache_file=None, session_max_age=6600, minimal_payload=False):
+        if aiohttp is None:
+            raise Exception("The async UniFi client requires aiohttp (pip3 install aiohttp)")
+        self.host = host
+        self.username = username
+        self.password = password
+        self.site = site
+        base_url = host if '://' in host else f"https://{host}"
+        self.os_url = base_url
+        self.network_url = f"{base_url}/proxy/network"
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.verifier = verifier or BackoffVerifier()
+        self.minimal_payload = minimal_payload
+        self.csrf_token = None
+        self.wlan_cache = {}
+        self.verifications = {}
+        self.last_verification = None
+        self.login_count = 0
+        self.timings = CallTimings()
+        self.auth_lock = asyncio.Lock()
+        self.session_key = f"{username}@{host}"
+        self.session_cache = SessionCache(session_cache_file, session_max_age) if session_cache_file else None
+        self.session_reused = False
+        # Each client keeps its own cookies; the connection pool itself may be shared.
+        # unsafe=True lets the jar accept cookies from controllers addressed by IP.
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            connector_owner=connector is None,
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+            timeout=self.timeout
+        )
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def connect(self):
+        """Restore a cached session or log in"""
+        with self.timings.phase('login'):
+            self.session_reused = self.restore_session()
+            if not self.session_reused:
+                await self.login()
+        if self.session_cache:
+            self.session_cache.record_run(self.session_key, self.session_reused)
+
+    async def close(self):
+        await self.session.close()
+
+    def restore_session(self):
+        if not self.session_cache:
+            return False
+        entry = self.session_cache.load(self.session_key)
+        if entry is None:
+            return False
+        cookies = {c['name']: c['value'] for c in entry.get('cookies', [])}
+        self.session.cookie_jar.update_cookies(cookies, response_url=URL(self.os_url))
+        self.csrf_token = entry.get('csrf_token')
+        print(f"[{datetime.now()}] [{self.host}] Reusing cached session (created {entry.get('created_at')})")
+        return True
+
+    async def login(self):
+        url = f"{self.os_url}/api/auth/login"
+        self.session.cookie_jar.clear()
+        start = time.monotonic()
+        async with self.session.post(url, json={"username": self.username, "password": self.password}) as response:
+            body = await response.read()
+            self.timings.record_call(
+                'POST', '/api/auth/login', response.status, time.monotonic() - start, 0, len(body)
+            )
+            response.raise_for_status()
+            self.csrf_token = response.headers.get('X-Csrf-Token')
+        self.login_count += 1
+        print(f"[{datetime.now()}] [{self.host}] Logged in successfully")
+
+        if self.session_cache:
+            cookies = [
+                {"name": c.key, "value": c.value, "domain": c['domain'], "path": c['path'] or '/',
+                 "expires": cookie_expiry(c)}
+                for c in self.session.cookie_jar
+            ]
+            self.session_cache.save(self.session_key, cookies, self.csrf_token)
+
+    async def request(self, method, url, json=None):
+        """Send a request and return the decoded JSON body, logging in again once after a 401/403"""
+        login_count = self.login_count
+        status, body = await self._send(method, url, json)
+
+        if status in (401, 403):
+            async with self.auth_lock:
+                if self.login_count == login_count:
+                    print(f"[{datetime.now()}] [{self.host}] Session rejected (HTTP {status}), logging in again")
+                    if self.session_cache:
+                        self.session_cache.invalidate(self.session_key)
+                        self.session_cache.record_relogin(self.session_key)
+                    with self.timings.phase('login'):
+                        await self.login()
+            status, body = await self._send(method, url, json)
+
+        if status >= 400:
+            raise HTTPStatusError(method, url, status)
+        return body
+
+    async def _send(self, method, url, json):
+        headers = {}
+        if self.csrf_token and method.upper() != 'GET':
+            headers['X-Csrf-Token'] = self.csrf_token
+        start = time.monotonic()
+        async with self.session.request(method, url, json=json, headers=headers) as response:
+            raw = await response.read()
+            self.timings.record_call(
+                method.upper(), url[len(self.os_url):], response.status, time.monotonic() - start,
+                len(json_module.dumps(json)) if json is not None else 0, len(raw)
+            )
+            updated_token = response.headers.get('X-Updated-Csrf-Token')
+            if updated_token and updated_token != self.csrf_token:
+                self.csrf_token = updated_token
+                if self.session_cache:
+                    self.session_cache.update_csrf(self.session_key, updated_token)
+            if response.status >= 400:
+                return response.status, None
+            return response.status, json_module.loads(raw)
+
+    async def get_wlan_configs(self):
+        body = await self.request('GET', f"{self.network_url}/api/s/{self.site}/rest/wlanconf")
+        wlans = body['data']
+        for wlan in wlans:
+            self.wlan_cache[wlan['_id']] = dict(wlan)
+        return wlans
+
+    async def get_wlan_by_id(self, wlan_id, use_cache=False):
+        if use_cache and wlan_id in self.wlan_cache:
+            return dict(self.wlan_cache[wlan_id])
+        body = await self.request('GET', f"{self.network_url}/api/s/{self.site}/rest/wlanconf/{wlan_id}")
+        wlan = body['data'][0]
+        self.wlan_cache[wlan_id] = dict(wlan)
+        return wlan
+
+    async def get_wlan_index(self):
+        return WLANIndex(await self.get_wlan_configs())
+
+    async def update_ssid(self, wlan_id, new_ssid):
+        url = f"{self.network_url}/api/s/{self.site}/rest/wlanconf/{wlan_id}"
+        current_config = await self.get_wlan_by_id(wlan_id, use_cache=True)
+        old_name = current_config['name']
+        if self.minimal_payload:
+            payload = {"name": new_ssid}
+        else:
+            payload = current_config
+            payload['name'] = new_ssid
+
+        with self.timings.phase('put'):
+            body = await self.request('PUT', url, json=payload)
+        self.wlan_cache.pop(wlan_id, None)
+
+        async def fetch_name():
+            return (await self.get_wlan_by_id(wlan_id))['name']
+
+        with self.timings.phase('verify'):
+            result = await wait_for_name(self.verifier, fetch_name, new_ssid)
+        self.last_verification = result
+        self.verifications[wlan_id] = result
+        if not result['converged']:
+            raise Exception(
+                f"SSID update verification failed: expected '{new_ssid}', "
+                f"but UniFi shows '{result['last_name']}' after {result['seconds']:.1f}s "
+                f"({result['polls']} polls)"
+            )
+
+        print(
+            f"[{datetime.now()}] [{self.host}] Updated SSID from '{old_name}' to '{new_ssid}' "
+            f"(verified in {result['seconds']:.2f}s, {result['polls']} polls)"
+        )
+        return body
@@ -1,23 +1,110 @@
 #!/usr/bin/env python3
-from flask import Flask, render_template_string, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
+import csv
+import functools
+import gzip
+import hashlib
 import json
 import os
+import socket
 import subprocess
-import re
-from datetime import datetime
-from ssid_validator import validate_ssid, get_ssid_byte_length, suggest_ssid_fix
-
-app = Flask(__name__)
+import threading
+from datetime import datetime, timedelta
+import log_status
+from event_broker import EventBroker
+from json_cache import JSONFileCache
+from ssid_validator import validate_ssid, get_ssid_byte_length, suggest_ssid_fixes
+from rotation_plan import PlanCompiler
+from ssid_store import ACTIVE, LIST_TYPES, SSIDStore
+
+try:
+    import brotli
+except ImportError:  # Optional dependency: assets are still served gzipped
+    brotli = None
+
+# The dashboard's CSS/JS are served by static_asset() under fingerprinted names
+app = Flask(__name__, static_folder=None)
+
+# Serialises load -> modify -> save of ssid_list.json across request threads
+data_lock = threading.RLock()
+
+# Revalidates ssid_list.json whenever it changes (here or by hand) and publishes
+# the rotation plan the rotator starts from; started in __main__
+plan_compiler = None
 
 CONFIG = {
     "ssid_list_file": "/var/lib/ssid_rotator/ssid_list.json",
     "state_file": "/var/lib/ssid_rotator/state.json",
-    "log_file": "/var/log/ssid-rotator.log"
+    "rotation_plan_file": "/var/lib/ssid_rotator/rotation_plan.json",
+    "validation_cache_file": "/var/lib/ssid_rotator/validation_cache.json",
+    "log_file": "/var/log/ssid-rotator.log",
+    "daemon_socket": "/run/ssid-rotator/rotator.sock",
+    "timer_stamp_file": "/var/lib/systemd/timers/stamp-ssid-rotator.timer"
 }
 
+# Must match rotate_ssid.py and ssid-rotator.timer (OnUnitActiveSec, OnBootSec)
+ROTATION_INTERVAL_HOURS = 18
+TIMER_BOOT_DELAY_MINUTES = 5
+
+# Parses only what has been appended to the rotation log since the last look;
+# shared by every request thread
+rotation_log = log_status.LogIndex(CONFIG['log_file'])
+
+# Parsed ssid_list.json and state.json, reused until the files change
+json_cache = JSONFileCache()
+
+# Dashboard CSS/JS: read, fingerprinted and compressed once at start-up
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+STATIC_FILES = {
+    'dashboard.css': 'text/css; charset=utf-8',
+    'dashboard.js': 'application/javascript; charset=utf-8'
+}
+STATIC_MAX_AGE = 365 * 24 * 3600
+
+def load_static_assets():
+    """
+    Fingerprint and precompress the files in STATIC_FILES.
+    Returns: tuple (urls, assets)
+        urls: file name -> fingerprinted URL, for asset_url()
+        assets: fingerprinted name -> {'content_type', 'etag', 'identity', 'gzip', 'br'}
+    """
+    urls = {}
+    assets = {}
+    for name, content_type in STATIC_FILES.items():
+        with open(os.path.join(STATIC_DIR, name), 'rb') as f:
+            body = f.read()
+        digest = hashlib.sha256(body).hexdigest()[:12]
+        stem, ext = os.path.splitext(name)
+        fingerprinted = f"{stem}.{digest}{ext}"
+        urls[name] = f"/static/{fingerprinted}"
+        assets[fingerprinted] = {
+            'content_type': content_type,
+            'etag': digest,
+            'identity': body,
+            'gzip': gzip.compress(body, compresslevel=9, mtime=0),
+            'br': brotli.compress(body, quality=11) if brotli else None
+        }
+    return urls, assets
+
+static_urls, static_assets = load_static_assets()
+
+def asset_url(name):
+    """Fingerprinted URL of a dashboard asset (available in the template)"""
+    return static_urls[name]
+
+app.jinja_env.globals['asset_url'] = asset_url
+
+# Next rotation time, keyed on the files it was computed from
+next_rotation_cache = {}
+next_rotation_lock = threading.Lock()
+
+# What detect_dashboard_changes() saw last time (only touched by the broker thread)
+dashboard_seen = {}
+
 def load_ssid_data():
     """Load SSID configuration"""
-    if not os.path.exists(CONFIG['ssid_list_file']):
+    data = json_cache.load(CONFIG['ssid_list_file'])
+    if data is None:
         return {
             "active_rotation": [],
             "reserve_pool": [],
@@ -25,23 +112,44 @@ def load_ssid_data():
             "last_updated": None,
             "updated_by": None
         }
-    
-    with open(CONFIG['ssid_list_file'], 'r') as f:
-        return json.load(f)
+    return data
 
 def save_ssid_data(data):
     """Save SSID configuration"""
     data['last_updated'] = datetime.now().isoformat()
-    with open(CONFIG['ssid_list_file'], 'w') as f:
-        json.dump(data, f, indent=2)
+    # Written atomically, so the rotator never reads a half-written list;
+    # the cache keeps what was written instead of reading it back
+    json_cache.write(CONFIG['ssid_list_file'], data)
+    if plan_compiler:
+        plan_compiler.compile_and_publish()
+
+def get_plan_errors():
+    """Problems the rotation plan compiler found in the current ssid_list.json"""
+    if not plan_compiler:
+        return []
+    # The watcher keeps latest in step with the file, so a dashboard poll
+    # neither re-reads nor re-hashes ssid_list.json or rotation_plan.json
+    plan = plan_compiler.latest
+    if plan is None or plan_compiler.watcher is None:
+        plan = plan_compiler.compile_and_publish()
+    return plan.get('errors', [])
+
+def load_ssid_store():
+    """Load SSID configuration plus an SSIDStore index over its three lists"""
+    data = load_ssid_data()
+    return data, SSIDStore(data)
+
+def with_data_lock(view):
+    """Run a view that modifies ssid_list.json while holding data_lock"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        with data_lock:
+            return view(*args, **kwargs)
+    return wrapper
 
 def load_state():
     """Load rotation state"""
-    if not os.path.exists(CONFIG['state_file']):
-        return None
-
-    with open(CONFIG['state_file'], 'r') as f:
-        return json.load(f)
+    return json_cache.load(CONFIG['state_file'])
 
 def get_rotation_status():
     """
@@ -50,83 +158,84 @@ def get_rotation_status():
         status: 'success', 'error', or 'unknown'
         message: descriptive message
     """
-    if not os.path.exists(CONFIG['log_file']):
-        return 'unknown', 'No log file found'
+    # Cached by the log index; a lookup only stats the log unless it has grown
+    return rotation_log.status()
 
+def file_signature(path):
+    """(mtime_ns, size, inode) of path, or None if it doesn't exist"""
     try:
-        # Read last 200 lines of log file
-        with open(CONFIG['log_file'], 'r') as f:
-            lines = f.readlines()
-            last_lines = lines[-200:] if len(lines) > 200 else lines
-
-        # Find the most recent "Starting SSID rotator" to identify the last run
-        last_rotation_start_idx = -1
-        for i in range(len(last_lines) - 1, -1, -1):
-            if 'Starting SSID rotator' in last_lines[i]:
-                last_rotation_start_idx = i
-                break
-
-        if last_rotation_start_idx == -1:
-            return 'unknown', 'No recent rotation found in logs'
-
-        # Look at lines from the last rotation start to end
-        rotation_lines = last_lines[last_rotation_start_idx:]
-
-        # Check if this rotation completed successfully
-        rotation_complete = False
-        error_found = False
-        error_msg = None
-
-        for line in rotation_lines:
-            if 'Rotation complete' in line or 'Updated SSID from' in line:
-                rotation_complete = True
-            elif 'ERROR:' in line:
-                error_found = True
-                error_msg = line.split('ERROR:', 1)[1].strip()
-
-        # Determine status based on findings
-        if rotation_complete and not error_found:
-            return 'success', 'Last rotation completed successfully'
-        elif error_found:
-            return 'error', f'Last rotation failed: {error_msg[:100] if error_msg else "Unknown error"}'
-        else:
-            return 'unknown', 'Rotation in progress or incomplete'
-
-    except Exception as e:
-        return 'unknown', f'Could not read log file: {str(e)}'
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
 
-def get_next_rotation_time():
+def compute_next_rotation_time():
     """
-    Get the next scheduled rotation time from systemd timer.
-    Returns: datetime object or None
+    Work out the next rotation from files, without asking systemd.
+    Returns: timezone-aware datetime object or None
     """
-    try:
-        # Run systemctl to get timer info
-        result = subprocess.run(
-            ['systemctl', 'list-timers', 'ssid-rotator.timer', '--no-pager'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
+    state = load_state() or {}
 
-        if result.returncode == 0:
-            # Parse output to find the NEXT column
-            lines = result.stdout.strip().split('\n')
-            for line in lines:
-                if 'ssid-rotator.timer' in line:
-                    # Extract date/time from the line
-                    # Format: "Thu 2025-12-18 19:46:39 MST"
-                    match = re.search(r'(\w{3} \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})', line)
-                    if match:
-                        time_str = match.group(1)
-                        # Parse: "Thu 2025-12-18 19:46:39"
-                        dt = datetime.strptime(time_str, '%a %Y-%m-%d %H:%M:%S')
-                        return dt
+    # The daemon persists its own schedule (jitter included); its socket only
+    # exists while it runs, so a stale value from an old daemon is ignored
+    daemon_running = os.path.exists(CONFIG['daemon_socket'])
+    if daemon_running and state.get('next_rotation_at'):
+        return datetime.fromisoformat(state['next_rotation_at']).astimezone()
 
+    # ssid-rotator.timer is Persistent=true, so systemd sets the stamp file's
+    # mtime to the time the timer last fired
+    try:
+        last_fired = datetime.fromtimestamp(os.stat(CONFIG['timer_stamp_file']).st_mtime).astimezone()
+    except OSError:
+        last_fired = None
+
+    if last_fired is None and state.get('last_rotation'):
+        last_fired = datetime.fromisoformat(state['last_rotation']).astimezone()
+
+    # After a reboot the timer first fires OnBootSec after boot, unless the
+    # daemon schedules rotations instead or that moment has already passed
+    if not daemon_running:
+        try:
+            with open('/proc/uptime', 'r') as f:
+                now = datetime.now().astimezone()
+                booted = now - timedelta(seconds=float(f.read().split()[0]))
+            boot_fire = booted + timedelta(minutes=TIMER_BOOT_DELAY_MINUTES)
+            if boot_fire > now and (last_fired is None or last_fired < boot_fire):
+                return boot_fire
+        except (OSError, ValueError, IndexError):
+            pass
+
+    if last_fired is None:
         return None
+    return last_fired + timedelta(hours=ROTATION_INTERVAL_HOURS)
 
-    except Exception as e:
-        return None
+def get_next_rotation_time():
+    """
+    Get the next scheduled rotation time.
+
+    Cached until the daemon starts or stops, state.json changes, the timer
+    fires or the cached time passes, so page loads cost a few stat() calls.
+    Returns: timezone-aware datetime object or None
+    """
+    key = (
+        os.path.exists(CONFIG['daemon_socket']),
+        file_signature(CONFIG['state_file']),
+        file_signature(CONFIG['timer_stamp_file'])
+    )
+    now = datetime.now().astimezone()
+    with next_rotation_lock:
+        expires = next_rotation_cache.get('expires')
+        if next_rotation_cache.get('key') != key or (expires is not None and now >= expires):
+            try:
+                value = compute_next_rotation_time()
+            except Exception:
+                value = None
+            next_rotation_cache['key'] = key
+            next_rotation_cache['value'] = value
+            # e.g. the boot-time firing: once it passes the answer changes
+            # even if no file does, so recompute once then
+            next_rotation_cache['expires'] = value if value is not None and value > now else None
+        return next_rotation_cache['value']
 
 def format_datetime(dt_str):
     """
@@ -159,343 +268,28 @@ HTML_TEMPLATE = '''
 <head>
     <title>SSID Rotation Manager</title>
     <meta name="viewport" content="width=device-width, initial-scale=1">
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
-            background: #f5f5f5;
-            padding: 20px;
-            line-height: 1.6;
-        }
-        .container {
-            max-width: 1000px;
-            margin: 0 auto;
-            background: white;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }
-        h1 { color: #333; margin-bottom: 10px; }
-        .subtitle { color: #666; margin-bottom: 30px; font-size: 14px; }
-        .section {
-            margin-bottom: 40px;
-            padding: 20px;
-            background: #f9f9f9;
-            border-radius: 8px;
-        }
-        .section h2 {
-            color: #444;
-            margin-bottom: 15px;
-            font-size: 18px;
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }
-        .badge {
-            background: #007bff;
-            color: white;
-            padding: 2px 8px;
-            border-radius: 12px;
-            font-size: 12px;
-            font-weight: normal;
-        }
-        .badge.cycle-time {
-            background: #28a745;
-        }
-        .badge.reserve {
-            background: #6c757d;
-        }
-        .list-container {
-            background: white;
-            border: 1px solid #ddd;
-            border-radius: 6px;
-            padding: 15px;
-        }
-        .ssid-item {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 12px;
-            border-bottom: 1px solid #eee;
-            transition: background 0.2s;
-        }
-        .ssid-item:last-child { border-bottom: none; }
-        .ssid-item:hover { background: #f5f5f5; }
-        .ssid-item.current {
-            background: #e3f2fd;
-            font-weight: bold;
-        }
-        .ssid-item.reserve {
-            background: #f8f9fa;
-        }
-        .ssid-item.protected {
-            background: #fff3cd;
-        }
-        .ssid-name {
-            display: flex;
-            align-items: center;
-            gap: 10px;
-            flex: 1;
-        }
-        .ssid-index {
-            background: #6c757d;
-            color: white;
-            width: 28px;
-            height: 28px;
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 12px;
-            font-weight: bold;
-        }
-        .ssid-item.reserve .ssid-index {
-            background: #adb5bd;
-        }
-        .tag {
-            padding: 3px 8px;
-            border-radius: 4px;
-            font-size: 11px;
-            font-weight: bold;
-            text-transform: uppercase;
-        }
-        .tag.current { background: #2196F3; color: white; }
-        .tag.next { background: #4CAF50; color: white; }
-        .tag.protected { background: #FF9800; color: white; }
-        .btn {
-            padding: 8px 12px;
-            border: none;
-            border-radius: 4px;
-            cursor: pointer;
-            font-size: 13px;
-            transition: all 0.2s;
-            margin-left: 5px;
-        }
-        .btn-delete {
-            background: #dc3545;
-            color: white;
-        }
-        .btn-delete:hover {
-            background: #c82333;
-        }
-        .btn-primary {
-            background: #007bff;
-            color: white;
-            padding: 10px 20px;
-        }
-        .btn-primary:hover {
-            background: #0056b3;
-        }
-        .btn-secondary {
-            background: #6c757d;
-            color: white;
-        }
-        .btn-secondary:hover {
-            background: #5a6268;
-        }
-        .btn-success {
-            background: #28a745;
-            color: white;
-        }
-        .btn-success:hover {
-            background: #218838;
-        }
-        .add-form {
-            display: flex;
-            gap: 10px;
-            margin-top: 15px;
-        }
-        .add-form input {
-            flex: 1;
-            padding: 10px;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            font-size: 14px;
-        }
-        .status-info {
-            background: #e3f2fd;
-            padding: 15px;
-            border-radius: 6px;
-            margin-bottom: 20px;
-        }
-        .status-row {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin: 8px 0;
-            font-size: 14px;
-        }
-        .status-label {
-            color: #666;
-        }
-        .status-value {
-            font-weight: bold;
-            color: #333;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }
-        /* Stoplight status indicators */
-        .status-indicator {
-            display: inline-block;
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            margin-right: 6px;
-            box-shadow: 0 0 4px rgba(0,0,0,0.3);
-        }
-        .status-indicator.success {
-            background: #28a745;
-            box-shadow: 0 0 8px rgba(40, 167, 69, 0.6);
-        }
-        .status-indicator.error {
-            background: #dc3545;
-            box-shadow: 0 0 8px rgba(220, 53, 69, 0.6);
-        }
-        .status-indicator.unknown {
-            background: #ffc107;
-            box-shadow: 0 0 8px rgba(255, 193, 7, 0.6);
-        }
-        /* Auto-refresh indicator */
-        .refresh-indicator {
-            position: fixed;
-            bottom: 20px;
-            right: 20px;
-            background: rgba(0, 0, 0, 0.7);
-            color: white;
-            padding: 8px 16px;
-            border-radius: 20px;
-            font-size: 12px;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-            z-index: 1000;
-            transition: opacity 0.3s;
-        }
-        .refresh-indicator:hover {
-            background: rgba(0, 0, 0, 0.85);
-        }
-        .refresh-pause-btn {
-            background: transparent;
-            border: 1px solid rgba(255, 255, 255, 0.5);
-            color: white;
-            padding: 2px 8px;
-            border-radius: 10px;
-            font-size: 11px;
-            cursor: pointer;
-            transition: all 0.2s;
-        }
-        .refresh-pause-btn:hover {
-            background: rgba(255, 255, 255, 0.2);
-            border-color: white;
-        }
-        .empty-state {
-            text-align: center;
-            padding: 40px;
-            color: #999;
-        }
-        .warning {
-            background: #fff3cd;
-            border: 1px solid #ffc107;
-            padding: 12px;
-            border-radius: 4px;
-            margin: 15px 0;
-            color: #856404;
-        }
-        .info-box {
-            background: #d1ecf1;
-            border: 1px solid #bee5eb;
-            padding: 12px;
-            border-radius: 4px;
-            margin: 15px 0;
-            color: #0c5460;
-            font-size: 13px;
-        }
-        .button-group {
-            display: flex;
-            gap: 5px;
-        }
-        .btn-make-next {
-            background: #28a745;
-            color: white;
-            border: none;
-            padding: 8px 14px;
-            border-radius: 4px;
-            cursor: pointer;
-            font-size: 13px;
-            font-weight: 500;
-        }
-        .btn-make-next:hover:not(:disabled) {
-            background: #218838;
-        }
-        .btn-make-next:disabled {
-            background: #6c757d;
-            cursor: not-allowed;
-            opacity: 0.7;
-        }
-        .btn-rotate {
-            background: #007bff;
-            color: white;
-            border: none;
-            padding: 14px 28px;
-            border-radius: 6px;
-            cursor: pointer;
-            font-size: 16px;
-            font-weight: bold;
-            width: 100%;
-            transition: background 0.2s;
-        }
-        .btn-rotate:hover:not(:disabled) {
-            background: #0056b3;
-        }
-        .btn-rotate:disabled {
-            background: #6c757d;
-            cursor: not-allowed;
-            opacity: 0.7;
-        }
-        .rotate-status {
-            margin-top: 10px;
-            padding: 12px;
-            border-radius: 4px;
-            display: none;
-            font-size: 14px;
-        }
-        .rotate-status.show {
-            display: block;
-        }
-        .rotate-status.loading {
-            background: #fff3cd;
-            color: #856404;
-            border: 1px solid #ffc107;
-        }
-        .rotate-status.success {
-            background: #d4edda;
-            color: #155724;
-            border: 1px solid #c3e6cb;
-        }
-        .rotate-status.error {
-            background: #f8d7da;
-            color: #721c24;
-            border: 1px solid #f5c6cb;
-        }
-        .ssid-item.next-item {
-            border-left: 4px solid #ffc107;
-            background: #fffbf0;
-        }
-        .tag.next {
-            background: #ffc107;
-            color: #000;
-        }
-        .tag.current {
-            background: #007bff;
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('dashboard.css') }}">
+    <meta name="state-etag" content="{{ state_etag }}">
 </head>
 <body>
     <div class="container">
         <h1>🔄 SSID Rotation Manager</h1>
         <p class="subtitle">Two-stage rotation system: Active rotation for fast cycles, reserve pool for storage</p>
 
+        <div data-section="plan_errors">{% block plan_errors %}
+        {% if plan_errors %}
+        <div class="warning">
+            ⚠️ The next rotation will fail until these problems in ssid_list.json are fixed:
+            <ul>
+                {% for error in plan_errors %}
+                <li>{{ error }}</li>
+                {% endfor %}
+            </ul>
+        </div>
+        {% endif %}
+        {% endblock %}</div>
+
+        <div data-section="status">{% block status %}
         {% if state %}
         <div class="status-info">
             <div class="status-row">
@@ -534,8 +328,21 @@ HTML_TEMPLATE = '''
             <div id="rotateStatus" class="rotate-status"></div>
         </div>
         {% endif %}
+        {% endblock %}</div>
+
+        <div class="batch-bar">
+            <label>
+                <input type="checkbox" id="batchToggle" onchange="toggleBatchMode(this.checked)">
+                Batch edit
+            </label>
+            <span class="batch-summary" id="batchSummary">Queue several changes and apply them in one save</span>
+            <button class="btn btn-primary" id="batchApply" onclick="applyBatch()" disabled>Apply</button>
+            <button class="btn btn-secondary" id="batchDiscard" onclick="discardBatch()" disabled>Discard</button>
+            <ul id="batchList"></ul>
+        </div>
 
         <div class="section">
+            <div data-section="active">{% block active %}
             <h2>
                 ⚡ Active Rotation
                 <span class="badge">{{ active|length }} SSIDs</span>
@@ -567,6 +374,8 @@ HTML_TEMPLATE = '''
                             {% else %}
                                 <button class="btn btn-make-next" onclick='makeNext({{ loop.index0 }}, {{ ssid|tojson }})'>Make Next</button>
                             {% endif %}
+                            <button class="btn btn-order" title="Move up" onclick='reorderSSID({{ ssid|tojson }}, -1)'>▲</button>
+                            <button class="btn btn-order" title="Move down" onclick='reorderSSID({{ ssid|tojson }}, 1)'>▼</button>
                             <button class="btn btn-secondary" onclick='moveToReserve({{ ssid|tojson }})'>→ Reserve</button>
                             <button class="btn btn-delete" onclick='deleteSSID({{ ssid|tojson }}, "active")'>Delete</button>
                         </div>
@@ -579,14 +388,17 @@ HTML_TEMPLATE = '''
                     </div>
                 {% endif %}
             </div>
+            {% endblock %}</div>
 
             <form class="add-form" onsubmit="addSSID(event, 'active')">
-                <input type="text" id="new-active-ssid" placeholder="Add new SSID to active rotation..." required>
+                <input type="text" id="new-active-ssid" oninput="checkSSID('active')" placeholder="Add new SSID to active rotation..." required>
                 <button type="submit" class="btn btn-primary">Add to Active</button>
             </form>
+            <div class="ssid-hint" id="hint-active"></div>
         </div>
 
         <div class="section">
+            <div data-section="reserve">{% block reserve %}
             <h2>
                 💾 Reserve Pool
                 <span class="badge reserve">{{ reserve|length }} SSIDs</span>
@@ -617,14 +429,23 @@ HTML_TEMPLATE = '''
                     </div>
                 {% endif %}
             </div>
+            {% endblock %}</div>
 
             <form class="add-form" onsubmit="addSSID(event, 'reserve')">
-                <input type="text" id="new-reserve-ssid" placeholder="Add new SSID to reserve pool..." required>
+                <input type="text" id="new-reserve-ssid" oninput="checkSSID('reserve')" placeholder="Add new SSID to reserve pool..." required>
                 <button type="submit" class="btn btn-primary">Add to Reserve</button>
             </form>
+            <div class="ssid-hint" id="hint-reserve"></div>
+
+            <form class="add-form" onsubmit="importSSIDs(event)">
+                <input type="file" id="import-file" accept=".txt,.csv,.ndjson,.jsonl" required>
+                <button type="submit" class="btn btn-secondary" id="importBtn">Import File to Reserve</button>
+            </form>
+            <div class="ssid-hint" id="import-status"></div>
         </div>
 
         <div class="section">
+            <div data-section="protected">{% block protected %}
             <h2>
                 🔒 Protected SSIDs
                 <span class="badge" style="background: #ff9800;">{{ protected|length }}</span>
@@ -652,217 +473,21 @@ HTML_TEMPLATE = '''
                     </div>
                 {% endif %}
             </div>
+            {% endblock %}</div>
 
             <form class="add-form" onsubmit="addSSID(event, 'protected')">
-                <input type="text" id="new-protected-ssid" placeholder="Enter SSID to protect..." required>
+                <input type="text" id="new-protected-ssid" oninput="checkSSID('protected')" placeholder="Enter SSID to protect..." required>
                 <button type="submit" class="btn btn-primary">Add Protected SSID</button>
             </form>
+            <div class="ssid-hint" id="hint-protected"></div>
         </div>
 
-        <div style="text-align: center; color: #999; font-size: 12px; margin-top: 30px;">
-            Last updated: {{ last_updated or 'Never' }}
+        <div style="text-align: center; color: #999; font-size: 12px; margin-top: 30px;" data-section="footer">
+            {%- block footer %}Last updated: {{ last_updated or 'Never' }}{% endblock -%}
         </div>
     </div>
 
-    <script>
-        function addSSID(event, listType) {
-            event.preventDefault();
-            const inputId = listType === 'active' ? 'new-active-ssid' : 
-                           listType === 'reserve' ? 'new-reserve-ssid' : 
-                           'new-protected-ssid';
-            const input = document.getElementById(inputId);
-            const ssid = input.value.trim();
-            
-            if (!ssid) return;
-
-            fetch('/api/add', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ ssid: ssid, list_type: listType })
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    location.reload();
-                } else {
-                    alert('Error: ' + data.error);
-                }
-            });
-        }
-
-        function deleteSSID(ssid, listType) {
-            if (!confirm(`Delete "${ssid}" from ${listType}?`)) return;
-
-            fetch('/api/delete', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ ssid: ssid, list_type: listType })
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    location.reload();
-                } else {
-                    alert('Error: ' + data.error);
-                }
-            });
-        }
-
-        function moveToReserve(ssid) {
-            if (!confirm(`Move "${ssid}" to reserve pool?`)) return;
-
-            fetch('/api/move', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ ssid: ssid, from: 'active', to: 'reserve' })
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    location.reload();
-                } else {
-                    alert('Error: ' + data.error);
-                }
-            });
-        }
-
-        function moveToActive(ssid) {
-            if (!confirm(`Move "${ssid}" to active rotation?`)) return;
-
-            fetch('/api/move', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ ssid: ssid, from: 'reserve', to: 'active' })
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.success) {
-                    location.reload();
-                } else {
-                    alert('Error: ' + data.error);
-                }
-            });
-        }
-
-        function makeNext(targetIndex, ssidName) {
-            if (!confirm(`Make "${ssidName}" the next SSID to rotate to?`)) {
-                return;
-            }
-            
-            fetch(`/api/set_next/${targetIndex}`, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json'
-                }
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.status === 'success') {
-                    alert(data.message);
-                    // Reload to show updated "NEXT" badge
-                    setTimeout(() => window.location.reload(), 500);
-                } else {
-                    alert('Error: ' + data.message);
-                }
-            })
-            .catch(error => {
-                alert('Network error: ' + error);
-            });
-        }
-
-        function rotateNow() {
-            const btn = document.getElementById('rotateBtn');
-            const statusDiv = document.getElementById('rotateStatus');
-            
-            if (!confirm('Push the staged SSID live to UniFi now?')) {
-                return;
-            }
-            
-            // Disable button and show loading
-            btn.disabled = true;
-            btn.innerHTML = '⏳ Rotating...';
-            statusDiv.className = 'rotate-status show loading';
-            statusDiv.innerHTML = 'Pushing SSID to UniFi...';
-            
-            fetch('/api/rotate_now', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json'
-                }
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.status === 'success') {
-                    statusDiv.className = 'rotate-status show success';
-                    statusDiv.innerHTML = '✅ ' + data.message;
-                    
-                    // Reload page after 2 seconds to show new SSID
-                    setTimeout(() => {
-                        window.location.reload();
-                    }, 2000);
-                } else {
-                    statusDiv.className = 'rotate-status show error';
-                    statusDiv.innerHTML = '❌ ' + data.message;
-                    if (data.error) {
-                        statusDiv.innerHTML += '<br><small>' + data.error + '</small>';
-                    }
-                    btn.disabled = false;
-                    btn.innerHTML = '🔄 Rotate SSID Now';
-                }
-            })
-            .catch(error => {
-                statusDiv.className = 'rotate-status show error';
-                statusDiv.innerHTML = '❌ Network error: ' + error;
-                btn.disabled = false;
-                btn.innerHTML = '🔄 Rotate SSID Now';
-            });
-        }
-
-        // Auto-refresh functionality
-        let refreshInterval = 60; // seconds
-        let refreshCountdown = refreshInterval;
-        let refreshTimer = null;
-        let isPaused = false;
-
-        function updateRefreshIndicator() {
-            const indicator = document.getElementById('refreshCountdown');
-            if (indicator) {
-                if (isPaused) {
-                    indicator.textContent = 'Paused';
-                } else {
-                    indicator.textContent = `Refreshing in ${refreshCountdown}s`;
-                }
-            }
-        }
-
-        function startRefreshTimer() {
-            refreshTimer = setInterval(() => {
-                if (!isPaused) {
-                    refreshCountdown--;
-                    updateRefreshIndicator();
-
-                    if (refreshCountdown <= 0) {
-                        window.location.reload();
-                    }
-                }
-            }, 1000);
-        }
-
-        function toggleRefreshPause() {
-            isPaused = !isPaused;
-            const btn = document.getElementById('pauseRefreshBtn');
-            if (btn) {
-                btn.textContent = isPaused ? 'Resume' : 'Pause';
-            }
-            updateRefreshIndicator();
-        }
-
-        // Start the refresh timer when page loads
-        window.addEventListener('DOMContentLoaded', function() {
-            updateRefreshIndicator();
-            startRefreshTimer();
-        });
-    </script>
+    <script src="{{ asset_url('dashboard.js') }}"></script>
 
     <!-- Auto-refresh indicator -->
     <div class="refresh-indicator">
@@ -873,8 +498,117 @@ HTML_TEMPLATE = '''
 </html>
 '''
 
-@app.route('/')
-def index():
+# Compiled once; render_template_string() would recompile it on every request
+DASHBOARD_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
+
+@app.route('/static/<filename>')
+def static_asset(filename):
+    """Serve a fingerprinted asset, precompressed, cacheable forever"""
+    asset = static_assets.get(filename)
+    if asset is None:
+        return Response('Not found', status=404, mimetype='text/plain')
+
+    encodings = request.accept_encodings
+    if asset['br'] is not None and encodings.quality('br') > 0:
+        encoding = 'br'
+    elif encodings.quality('gzip') > 0:
+        encoding = 'gzip'
+    else:
+        encoding = 'identity'
+    # Each encoding is a different representation, so it gets its own strong ETag
+    etag = f"{asset['etag']}-{encoding}"
+
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(asset[encoding], content_type=asset['content_type'])
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'public, max-age={STATIC_MAX_AGE}, immutable'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+def rotation_event_data(record):
+    return {
+        'status': record['status'],
+        'trigger': record['trigger'],
+        'started_at': record['started_at'].isoformat() if record['started_at'] else None,
+        'error': record['error'],
+        'duration': record['duration']
+    }
+
+def detect_dashboard_changes():
+    """
+    Event broker poll: compare the rotation log, ssid_list.json and state.json
+    with what was seen on the previous call.
+    Returns: list of (event_name, data) tuples
+    """
+    record = rotation_log.latest()
+    run = (record['started_at'], record['trigger']) if record else None
+    list_signature = file_signature(CONFIG['ssid_list_file'])
+    state_signature = file_signature(CONFIG['state_file'])
+
+    if not dashboard_seen:
+        # First look: remember where things stand; nothing has changed yet
+        state = load_state() or {}
+        dashboard_seen.update(
+            run=run,
+            run_status=record['status'] if record else None,
+            list_signature=list_signature,
+            state_signature=state_signature,
+            staged=(state.get('current_index'), state.get('staged_at'))
+        )
+        return []
+
+    events = []
+
+    if record is not None:
+        if run != dashboard_seen['run']:
+            events.append(('rotation_started', rotation_event_data(record)))
+            dashboard_seen['run'] = run
+            dashboard_seen['run_status'] = 'in_progress'
+        # A short run can start and finish between two polls; report both
+        if record['status'] != dashboard_seen['run_status'] and record['status'] != 'in_progress':
+            name = 'rotation_completed' if record['status'] == 'success' else 'rotation_failed'
+            events.append((name, rotation_event_data(record)))
+        dashboard_seen['run_status'] = record['status']
+
+    if list_signature != dashboard_seen['list_signature']:
+        dashboard_seen['list_signature'] = list_signature
+        data = load_ssid_data()
+        events.append(('list_edited', {
+            'active': len(data.get('active_rotation', [])),
+            'reserve': len(data.get('reserve_pool', [])),
+            'protected': len(data.get('protected_ssids', [])),
+            'last_updated': data.get('last_updated')
+        }))
+
+    if state_signature != dashboard_seen['state_signature']:
+        dashboard_seen['state_signature'] = state_signature
+        state = load_state() or {}
+        staged = (state.get('current_index'), state.get('staged_at'))
+        if staged != dashboard_seen['staged']:
+            dashboard_seen['staged'] = staged
+            active = load_ssid_data().get('active_rotation', [])
+            current_index = state.get('current_index')
+            next_ssid = active[(current_index + 1) % len(active)] if active and current_index is not None else None
+            events.append(('staged_next_changed', {
+                'current_index': current_index,
+                'next_ssid': next_ssid,
+                'staged_by_user': state.get('staged_by_user', False)
+            }))
+
+    return events
+
+# Pushes dashboard changes to every open page over /api/events; started in __main__
+event_broker = EventBroker(detect_dashboard_changes)
+
+DASHBOARD_SECTIONS = ('plan_errors', 'status', 'active', 'reserve', 'protected', 'footer')
+
+def dashboard_context():
+    """Everything the dashboard shows, as template variables"""
     data = load_ssid_data()
     state = load_state()
 
@@ -887,20 +621,117 @@ def index():
     next_rotation_formatted = format_datetime(next_rotation_time) if next_rotation_time else 'Unknown'
     last_updated_formatted = format_datetime(data.get('last_updated'))
 
-    return render_template_string(
-        HTML_TEMPLATE,
-        active=data.get('active_rotation', []),
-        reserve=data.get('reserve_pool', []),
-        protected=data.get('protected_ssids', []),
-        last_updated=last_updated_formatted,
-        state=state,
-        rotation_status=rotation_status,
-        rotation_message=rotation_message,
-        last_rotation_formatted=last_rotation_formatted,
-        next_rotation_formatted=next_rotation_formatted
-    )
+    return {
+        'active': data.get('active_rotation', []),
+        'reserve': data.get('reserve_pool', []),
+        'protected': data.get('protected_ssids', []),
+        'last_updated': last_updated_formatted,
+        'state': state,
+        'rotation_status': rotation_status,
+        'rotation_message': rotation_message,
+        'next_rotation_time': next_rotation_time,
+        'last_rotation_formatted': last_rotation_formatted,
+        'next_rotation_formatted': next_rotation_formatted,
+        'plan_errors': get_plan_errors()
+    }
+
+# Changes when the template or asset fingerprints do (i.e. on upgrade), so an
+# ETag from a previous version never matches
+DASHBOARD_TEMPLATE_VERSION = hashlib.sha256(
+    (HTML_TEMPLATE + json.dumps(static_urls, sort_keys=True)).encode('utf-8')
+).hexdigest()
+
+# Last /api/state body, keyed by its ETag
+dashboard_state_cache = {}
+dashboard_state_lock = threading.Lock()
+
+def dashboard_etag():
+    """
+    ETag of the dashboard state, from what it is built from rather than
+    from the rendered output: the ssid_list.json and state.json signatures,
+    the rotation log position, the next rotation time and the compiled plan.
+    Costs a few stat() calls, so a 304 doesn't render anything.
+    """
+    plan = plan_compiler.latest if plan_compiler else None
+    next_rotation_time = get_next_rotation_time()
+    inputs = json.dumps([
+        DASHBOARD_TEMPLATE_VERSION,
+        file_signature(CONFIG['ssid_list_file']),
+        file_signature(CONFIG['state_file']),
+        rotation_log.version(),
+        next_rotation_time.isoformat() if next_rotation_time else None,
+        [plan.get('source_signature'), plan.get('compiled_at')] if plan else None
+    ])
+    return hashlib.sha256(inputs.encode('utf-8')).hexdigest()[:32]
+
+def dashboard_state(context):
+    """
+    The /api/state document for a dashboard context: JSON text with the raw
+    values plus the rendered HTML of each dashboard section, so the page can
+    swap in only what changed.
+    """
+    template_context = DASHBOARD_TEMPLATE.new_context(context)
+    sections = {
+        name: ''.join(DASHBOARD_TEMPLATE.blocks[name](template_context))
+        for name in DASHBOARD_SECTIONS
+    }
+    next_rotation_time = context['next_rotation_time']
+    return json.dumps({
+        'active': context['active'],
+        'reserve': context['reserve'],
+        'protected': context['protected'],
+        'state': context['state'],
+        'rotation_status': context['rotation_status'],
+        'rotation_message': context['rotation_message'],
+        'next_rotation': next_rotation_time.isoformat() if next_rotation_time else None,
+        'plan_errors': context['plan_errors'],
+        'sections': sections
+    }, sort_keys=True)
+
+@app.route('/')
+def index():
+    # Taken before reading the files, so a change made meanwhile gives the
+    # page's first /api/state poll a fresh body rather than a wrong 304
+    etag = dashboard_etag()
+    context = dashboard_context()
+    context['state_etag'] = etag
+    return DASHBOARD_TEMPLATE.render(**context)
+
+@app.route('/api/state')
+def api_state():
+    """Read-only dashboard state; 304 Not Modified while the ETag still matches"""
+    etag = dashboard_etag()
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        with dashboard_state_lock:
+            body = dashboard_state_cache.get(etag)
+        if body is None:
+            body = dashboard_state(dashboard_context())
+            with dashboard_state_lock:
+                dashboard_state_cache.clear()
+                dashboard_state_cache[etag] = body
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    # Always revalidate; never serve a stale status from cache
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/events')
+def api_events():
+    """Server-Sent Events: rotation started/completed/failed, list_edited, staged_next_changed"""
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        last_event_id = None
+    response = Response(event_broker.stream(last_event_id), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Don't let a reverse proxy buffer the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 @app.route('/api/add', methods=['POST'])
+@with_data_lock
 def add_ssid():
     req_data = request.json
     ssid = req_data.get('ssid', '').strip()
@@ -913,12 +744,13 @@ def add_ssid():
     is_valid, error_msg = validate_ssid(ssid, strict=True)
     if not is_valid:
         # Try to suggest a fix
-        suggested = suggest_ssid_fix(ssid)
-        if suggested:
+        suggestions = suggest_ssid_fixes(ssid)
+        if suggestions:
             return jsonify({
                 'success': False,
                 'error': error_msg,
-                'suggestion': suggested,
+                'suggestion': suggestions[0],
+                'suggestions': suggestions,
                 'byte_length': get_ssid_byte_length(ssid)
             })
         else:
@@ -928,36 +760,308 @@ def add_ssid():
                 'byte_length': get_ssid_byte_length(ssid)
             })
 
-    data = load_ssid_data()
+    data, store = load_ssid_store()
 
-    # Check if SSID already exists in any list
-    all_ssids = (data.get('active_rotation', []) +
-                 data.get('reserve_pool', []) +
-                 data.get('protected_ssids', []))
-
-    if ssid in all_ssids:
-        return jsonify({'success': False, 'error': 'SSID already exists in another list'})
-
-    # Add to appropriate list
-    if list_type == 'protected':
-        if 'protected_ssids' not in data:
-            data['protected_ssids'] = []
-        data['protected_ssids'].append(ssid)
-    elif list_type == 'reserve':
-        if 'reserve_pool' not in data:
-            data['reserve_pool'] = []
-        data['reserve_pool'].append(ssid)
-    else:  # 'active'
-        if 'active_rotation' not in data:
-            data['active_rotation'] = []
-        data['active_rotation'].append(ssid)
+    # Add to appropriate list ('active' unless 'reserve' or 'protected'),
+    # refusing names that already exist in any list
+    try:
+        store.add(LIST_TYPES.get(list_type, ACTIVE), ssid)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)})
 
+    store.write_to(data)
     data['updated_by'] = 'web_interface'
     save_ssid_data(data)
 
     return jsonify({'success': True, 'byte_length': get_ssid_byte_length(ssid)})
 
+@app.route('/api/validate', methods=['POST'])
+def validate_ssid_live():
+    """Validate an SSID as it is typed (same rules and trimming as /api/add)"""
+    body = request.get_json(silent=True)
+    ssid = body.get('ssid', '') if isinstance(body, dict) else None
+    if not isinstance(ssid, str):
+        return jsonify({'valid': False, 'error': 'SSID must be a string', 'byte_length': 0, 'suggestions': []}), 400
+
+    ssid = ssid.strip()
+    if not ssid:
+        return jsonify({'valid': False, 'error': None, 'byte_length': 0, 'suggestions': []})
+
+    is_valid, error_msg = validate_ssid(ssid, strict=True)
+    # Called on every keystroke: share one read-only index per version of the file
+    store = json_cache.derive(CONFIG['ssid_list_file'], 'store', SSIDStore)
+    duplicate = store is not None and ssid in store
+
+    return jsonify({
+        'valid': is_valid and not duplicate,
+        'error': 'SSID already exists in another list' if is_valid and duplicate else error_msg,
+        'byte_length': get_ssid_byte_length(ssid),
+        'suggestions': [] if is_valid else suggest_ssid_fixes(ssid)
+    })
+
+def decode_import_lines(stream, bad_lines):
+    """
+    Decode an uploaded file line by line, strictly as UTF-8.
+
+    A line that isn't valid UTF-8 is yielded with its bad bytes replaced (so
+    CSV rows still line up) and its number is added to bad_lines. Checking
+    for U+FFFD afterwards would also reject names that really contain it.
+    """
+    for line_number, raw in enumerate(stream, 1):
+        if line_number == 1 and raw.startswith(b'\xef\xbb\xbf'):
+            raw = raw[3:]
+        try:
+            yield raw.decode('utf-8')
+        except UnicodeDecodeError:
+            bad_lines.add(line_number)
+            yield raw.decode('utf-8', errors='replace')
+
+def iter_import_entries(stream, fmt):
+    """
+    Parse an uploaded SSID list line by line as it arrives.
+
+    Args:
+        stream: Binary request body
+        fmt (str): 'text' (one SSID per line), 'csv' (first column, or the
+                   column headed 'ssid') or 'ndjson' (strings, or objects with
+                   'ssid' and optional 'list_type')
+
+    Yields:
+        tuple: (line_number, ssid, list_type or None, parse_error or None)
+    """
+    bad_lines = set()
+    text = decode_import_lines(stream, bad_lines)
+
+    if fmt == 'csv':
+        reader = csv.reader(text)
+        column = 0
+        row_end = 0
+        for row in reader:
+            # A quoted field can span lines; the row is bad if any of them is
+            row_start, row_end = row_end + 1, reader.line_num
+            if any(line in bad_lines for line in range(row_start, row_end + 1)):
+                yield reader.line_num, None, None, "Line is not valid UTF-8"
+                continue
+            lowered = [cell.strip().lower() for cell in row]
+            if reader.line_num == 1 and 'ssid' in lowered:
+                column = lowered.index('ssid')
+                continue
+            ssid = row[column] if column < len(row) else ''
+            if ssid.strip():
+                yield reader.line_num, ssid, None, None
+        return
+
+    for line_number, line in enumerate(text, 1):
+        if line_number in bad_lines:
+            yield line_number, None, None, "Line is not valid UTF-8"
+            continue
+        line = line.rstrip('\r\n')
+        if not line.strip():
+            continue
+        if fmt != 'ndjson':
+            yield line_number, line, None, None
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, None, f"Invalid JSON: {e}"
+            continue
+        if isinstance(entry, dict):
+            yield line_number, entry.get('ssid'), entry.get('list_type'), None
+        else:
+            yield line_number, entry, None, None
+
+@app.route('/api/import', methods=['POST'])
+def import_ssids():
+    """
+    Bulk-import SSIDs from a streamed upload.
+
+    Query parameters: list_type (default 'reserve'), format ('text', 'csv'
+    or 'ndjson'; default from the Content-Type) and dry_run=1 to only check.
+    Entries are parsed and validated as the upload arrives, without holding
+    data_lock, so a slow upload doesn't block other edits. The valid ones are
+    then deduplicated against all three lists (and the rest of the upload)
+    and saved in a single write under the lock. The response is NDJSON: one
+    result per entry, then a summary line. Results are not in upload order:
+    invalid entries are reported as soon as they are seen, and the added and
+    duplicate ones (in upload order) once the whole upload has been read.
+    Each result carries its 'line' number.
+    """
+    list_type = request.args.get('list_type', 'reserve')
+    if list_type not in LIST_TYPES:
+        return jsonify({'success': False, 'error': f"Invalid list_type '{list_type}'"}), 400
+
+    fmt = request.args.get('format')
+    if not fmt:
+        content_type = request.mimetype or ''
+        if content_type in ('text/csv', 'application/csv'):
+            fmt = 'csv'
+        elif content_type in ('application/x-ndjson', 'application/jsonl', 'application/json'):
+            fmt = 'ndjson'
+        else:
+            fmt = 'text'
+    dry_run = request.args.get('dry_run', '').lower() in ('1', 'true', 'yes')
+    list_names = {key: name for name, key in LIST_TYPES.items()}
+
+    def generate():
+        counts = {'added': 0, 'duplicate': 0, 'invalid': 0}
+        accepted = []  # (result, target) for valid entries, in upload order
+
+        for line_number, ssid, entry_list, error in iter_import_entries(request.stream, fmt):
+            if isinstance(ssid, str):
+                ssid = ssid.strip()
+            result = {'line': line_number, 'ssid': ssid}
+            target = LIST_TYPES.get(entry_list or list_type)
+
+            if error is None and target is None:
+                error = f"Invalid list_type '{entry_list}'"
+            if error is None:
+                is_valid, error = validate_ssid(ssid, strict=True)
+                if not is_valid:
+                    result['suggestions'] = suggest_ssid_fixes(ssid)
+
+            if error:
+                result.update(status='invalid', error=error)
+                counts['invalid'] += 1
+                yield json.dumps(result) + "\n"
+            else:
+                accepted.append((result, target))
+
+        committed = False
+        with data_lock:
+            # Accepted names go into the store as we go, so later lines dedupe against them too
+            data, store = load_ssid_store()
+            for result, target in accepted:
+                ssid = result['ssid']
+                if ssid in store:
+                    result.update(status='duplicate', list=list_names[store.list_of(ssid)])
+                    counts['duplicate'] += 1
+                else:
+                    store.add(target, ssid)
+                    result.update(status='added', list=list_names[target])
+                    counts['added'] += 1
+
+            if counts['added'] and not dry_run:
+                store.write_to(data)
+                data['updated_by'] = 'web_import'
+                save_ssid_data(data)
+                committed = True
+
+        for result, target in accepted:
+            yield json.dumps(result) + "\n"
+        yield json.dumps({'summary': counts, 'committed': committed, 'dry_run': dry_run}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+def apply_operation(store, operation):
+    """
+    Apply one /api/batch operation to an SSIDStore.
+
+    Raises:
+        ValueError: If the operation is invalid; the message is shown to the user
+    """
+    op = operation.get('op')
+    ssid = operation.get('ssid')
+    if isinstance(ssid, str):
+        ssid = ssid.strip()
+    list_type = operation.get('list_type', 'active')
+
+    if op in ('add', 'delete', 'reorder') and list_type not in LIST_TYPES:
+        raise ValueError(f"Invalid list_type '{list_type}'")
+
+    if op == 'add':
+        if not ssid:
+            raise ValueError('SSID name is required')
+        is_valid, error_msg = validate_ssid(ssid, strict=True)
+        if not is_valid:
+            raise ValueError(f"'{ssid}': {error_msg}")
+        try:
+            store.add(LIST_TYPES[list_type], ssid)
+        except ValueError as e:
+            raise ValueError(f"'{ssid}': {e}")
+
+    elif op == 'delete':
+        try:
+            store.remove(LIST_TYPES[list_type], ssid)
+        except ValueError as e:
+            raise ValueError(f"'{ssid}': {e}")
+
+    elif op == 'move':
+        from_list = operation.get('from', 'active')
+        to_list = operation.get('to', 'reserve')
+        # Same rule as /api/move: only active <-> reserve
+        if from_list not in ('active', 'reserve'):
+            raise ValueError('Invalid source list')
+        if to_list not in ('active', 'reserve'):
+            raise ValueError('Invalid destination list')
+        try:
+            store.move(ssid, LIST_TYPES[from_list], LIST_TYPES[to_list])
+        except ValueError as e:
+            raise ValueError(f"'{ssid}': {e}")
+
+    elif op == 'reorder':
+        key = LIST_TYPES[list_type]
+        if 'order' in operation:
+            # Full new order: must be a permutation of the current list
+            order = operation['order']
+            if not isinstance(order, list) or not all(isinstance(name, str) for name in order):
+                raise ValueError("'order' must be a list of SSIDs")
+            store.replace_list(key, order)
+        else:
+            if not isinstance(ssid, str) or not store.in_list(ssid, key):
+                raise ValueError(f"'{ssid}': SSID not found in {list_type} list")
+            # bool is an int subclass; true/false are not positions
+            if 'position' in operation:
+                new_position = operation['position']
+                if type(new_position) is not int:
+                    raise ValueError("'position' must be a whole number")
+            else:
+                offset = operation.get('offset', 0)
+                if type(offset) is not int:
+                    raise ValueError("'offset' must be a whole number")
+                new_position = store.get_list(key).index(ssid) + offset
+            store.reorder(key, ssid, new_position)
+
+    else:
+        raise ValueError(f"Unknown operation '{op}'")
+
+@app.route('/api/batch', methods=['POST'])
+@with_data_lock
+def batch_update():
+    """
+    Apply an ordered list of add/delete/move/reorder operations atomically.
+
+    Operations run in order against a working copy; if any fails, nothing is
+    saved and the failing operation is reported. Otherwise the result is
+    written once.
+    """
+    operations = (request.json or {}).get('operations')
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'success': False, 'error': 'operations must be a non-empty list'}), 400
+
+    # The store copies the lists, so a failed batch leaves data untouched
+    data, store = load_ssid_store()
+
+    for i, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            return jsonify({'success': False, 'error': 'Each operation must be an object', 'index': i}), 400
+        try:
+            apply_operation(store, operation)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': f"Operation {i + 1} ({operation.get('op')}): {e}",
+                'index': i
+            }), 400
+
+    store.write_to(data)
+    data['updated_by'] = 'web_interface'
+    save_ssid_data(data)
+
+    return jsonify({'success': True, 'applied': len(operations)})
+
 @app.route('/api/delete', methods=['POST'])
+@with_data_lock
 def delete_ssid():
     req_data = request.json
     ssid = req_data.get('ssid', '').strip()
@@ -966,31 +1070,22 @@ def delete_ssid():
     if not ssid:
         return jsonify({'success': False, 'error': 'SSID name is required'})
     
-    data = load_ssid_data()
+    data, store = load_ssid_store()
     
     # Remove from appropriate list
-    if list_type == 'protected':
-        if ssid in data.get('protected_ssids', []):
-            data['protected_ssids'].remove(ssid)
-        else:
-            return jsonify({'success': False, 'error': 'SSID not found in protected list'})
-    elif list_type == 'reserve':
-        if ssid in data.get('reserve_pool', []):
-            data['reserve_pool'].remove(ssid)
-        else:
-            return jsonify({'success': False, 'error': 'SSID not found in reserve pool'})
-    else:  # 'active'
-        if ssid in data.get('active_rotation', []):
-            data['active_rotation'].remove(ssid)
-        else:
-            return jsonify({'success': False, 'error': 'SSID not found in active rotation'})
+    try:
+        store.remove(LIST_TYPES.get(list_type, ACTIVE), ssid)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)})
     
+    store.write_to(data)
     data['updated_by'] = 'web_interface'
     save_ssid_data(data)
     
     return jsonify({'success': True})
 
 @app.route('/api/move', methods=['POST'])
+@with_data_lock
 def move_ssid():
     """Move SSID between active and reserve lists"""
     req_data = request.json
@@ -1001,32 +1096,20 @@ def move_ssid():
     if not ssid:
         return jsonify({'success': False, 'error': 'SSID name is required'})
     
-    data = load_ssid_data()
-    
-    # Remove from source list
-    if from_list == 'active':
-        if ssid not in data.get('active_rotation', []):
-            return jsonify({'success': False, 'error': 'SSID not found in active rotation'})
-        data['active_rotation'].remove(ssid)
-    elif from_list == 'reserve':
-        if ssid not in data.get('reserve_pool', []):
-            return jsonify({'success': False, 'error': 'SSID not found in reserve pool'})
-        data['reserve_pool'].remove(ssid)
-    else:
+    # Only active <-> reserve; protected SSIDs are managed separately
+    if from_list not in ('active', 'reserve'):
         return jsonify({'success': False, 'error': 'Invalid source list'})
-    
-    # Add to destination list
-    if to_list == 'active':
-        if 'active_rotation' not in data:
-            data['active_rotation'] = []
-        data['active_rotation'].append(ssid)
-    elif to_list == 'reserve':
-        if 'reserve_pool' not in data:
-            data['reserve_pool'] = []
-        data['reserve_pool'].append(ssid)
-    else:
+    if to_list not in ('active', 'reserve'):
         return jsonify({'success': False, 'error': 'Invalid destination list'})
+
+    data, store = load_ssid_store()
+
+    try:
+        store.move(ssid, LIST_TYPES[from_list], LIST_TYPES[to_list])
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)})
     
+    store.write_to(data)
     data['updated_by'] = 'web_interface'
     save_ssid_data(data)
     
@@ -1065,8 +1148,7 @@ def set_next(target_index):
         state['staged_at'] = datetime.now().isoformat()
         
         # Save state
-        with open(CONFIG['state_file'], 'w') as f:
-            json.dump(state, f, indent=2)
+        json_cache.write(CONFIG['state_file'], state)
         
         return jsonify({
             'status': 'success',
@@ -1084,6 +1166,38 @@ def set_next(target_index):
 @app.route('/api/rotate_now', methods=['POST'])
 def rotate_now():
     """Manually trigger SSID rotation"""
+    # Prefer the resident daemon: it rotates on an already warm session and
+    # serialises with its own schedule. Fall back to a one-off script run.
+    if os.path.exists(CONFIG['daemon_socket']):
+        from rotator_daemon import DaemonResponseError, send_command
+        try:
+            result = send_command('rotate', CONFIG['daemon_socket'])
+        except (FileNotFoundError, ConnectionRefusedError):
+            result = None  # Stale socket (daemon not running); use the script instead
+        except socket.timeout:
+            # The daemon took the request and is still working on it; running
+            # the script now would start a second rotation alongside it
+            return jsonify({
+                'status': 'running',
+                'message': 'The rotator daemon is still rotating; the dashboard will update when it finishes'
+            }), 202
+        except (DaemonResponseError, OSError) as e:
+            # The daemon may or may not have rotated, so don't retry with the script
+            return jsonify({
+                'status': 'error',
+                'message': 'No usable reply from the rotator daemon; check the log before retrying',
+                'error': str(e)
+            }), 502
+
+        if result is not None:
+            if result.get('status') == 'success':
+                return jsonify(result)
+            return jsonify({
+                'status': 'error',
+                'message': 'Rotation failed',
+                'error': result.get('message')
+            }), 500
+
     try:
         import subprocess
 
@@ -1129,6 +1243,12 @@ def rotate_now():
 if __name__ == '__main__':
     import ssl
     import os
+
+    plan_compiler = PlanCompiler(
+        CONFIG['ssid_list_file'], CONFIG['rotation_plan_file'], CONFIG['validation_cache_file']
+    )
+    plan_compiler.start()
+    event_broker.start()
     
     # SSL certificate paths
     cert_dir = os.path.expanduser('~/certs')